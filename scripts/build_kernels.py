@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from numba.pycc import CC
+
+from money_system import _kernels
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ahead-of-time compile the simulation kernels")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path(_kernels.__file__).parent,
+        help="Directory for the compiled extension (defaults to the money_system package)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    cc = CC("_aot_kernels")
+    cc.output_dir = str(args.output_dir)
+    cc.export("run_steps", _kernels.RUN_STEPS_SIGNATURE)(_kernels.run_steps.py_func)
+    # _kernels ignores the build once its source no longer matches this stamp.
+    stamp = _kernels.kernel_source_hash()
+    cc.export("source_hash", "i8()")(lambda: stamp)
+    cc.compile()
+
+
+if __name__ == "__main__":
+    main()
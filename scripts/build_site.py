@@ -3,11 +3,14 @@ from __future__ import annotations
 import argparse
 import html
 import json
+import shutil
 from datetime import datetime, timezone
 from pathlib import Path
 
+from money_system._site_template import STYLESHEET, TEMPLATE
 from money_system.config import ModelConfig
-from money_system.interactive import build_figures, render_figures_html
+from money_system.interactive import build_figures, dump_figures_json
+from money_system.io import FORMATS, write_results
 from money_system.model import MoneySystemModel
 
 
@@ -15,10 +18,11 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build GitHub Pages site with interactive plots")
     parser.add_argument("--steps", type=int, default=240, help="Number of monthly steps")
     parser.add_argument("--output-dir", type=Path, default=Path("docs"), help="Output directory")
+    parser.add_argument("--format", choices=FORMATS, default="csv", help="Output format for result tables")
     return parser.parse_args()
 
 
-def build_page(figures_html: dict[str, str]) -> str:
+def build_page() -> str:
     built_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
     params = ModelConfig()
     initial = params.resolve_initial()
@@ -36,334 +40,11 @@ def build_page(figures_html: dict[str, str]) -> str:
         "tga_target": params.tga_target,
     }
     params_json = html.escape(json.dumps(params_dict, indent=2, sort_keys=True))
-    return f"""<!doctype html>
-<html lang=\"en\">
-  <head>
-    <meta charset=\"utf-8\" />
-    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
-    <title>Money System Simulation</title>
-    <script src=\"https://cdn.plot.ly/plotly-2.27.0.min.js\"></script>
-    <style>
-      :root {{
-        --bg: #f5f3ef;
-        --ink: #1f1d1a;
-        --muted: #5f5a54;
-        --accent: #1b4965;
-        --card: #ffffff;
-      }}
-      body {{
-        margin: 0;
-        font-family: "IBM Plex Sans", "Segoe UI", sans-serif;
-        background: var(--bg);
-        color: var(--ink);
-        line-height: 1.6;
-      }}
-      header {{
-        padding: 48px 24px 24px;
-        background: linear-gradient(120deg, #f5f3ef 0%, #e2ddd4 100%);
-        border-bottom: 1px solid #ded7ce;
-      }}
-      header h1 {{
-        margin: 0 0 8px 0;
-        font-size: 2rem;
-        color: var(--accent);
-      }}
-      header p {{
-        margin: 0;
-        max-width: 760px;
-        color: var(--muted);
-      }}
-      main {{
-        max-width: 1100px;
-        margin: 0 auto;
-        padding: 24px;
-      }}
-      section {{
-        margin-bottom: 36px;
-        background: var(--card);
-        padding: 20px;
-        border-radius: 12px;
-        box-shadow: 0 8px 24px rgba(0, 0, 0, 0.06);
-      }}
-      section h2 {{
-        margin-top: 0;
-        color: var(--accent);
-      }}
-      pre {{
-        white-space: pre-wrap;
-        word-break: break-word;
-        background: #f7f5f1;
-        padding: 12px;
-        border-radius: 8px;
-        border: 1px solid #e6e1d7;
-      }}
-      code {{
-        white-space: pre-wrap;
-      }}
-      .figure {{
-        margin-top: 16px;
-      }}
-      footer {{
-        padding: 24px;
-        text-align: center;
-        color: var(--muted);
-        font-size: 0.9rem;
-      }}
-      @media (max-width: 720px) {{
-        header {{
-          padding: 32px 16px 16px;
-        }}
-        main {{
-          padding: 16px;
-        }}
-      }}
-    </style>
-  </head>
-  <body>
-    <header>
-      <h1>Money System Simulation</h1>
-      <p>
-        Stock-flow consistent model with private sector, commercial banks, government, and central bank.
-        This page explains the model and embeds the interactive figures alongside the narrative.
-      </p>
-    </header>
-    <main>
-      <section>
-        <h2>Model Structure</h2>
-        <p>
-          The model is stock-flow consistent (SFC) and tracks assets, liabilities, and equity for each
-          sector: Private, Banks, Government (Treasury), and Central Bank. The core instruments are
-          deposits, loans, reserves, government bonds, and the Treasury General Account (TGA).
-        </p>
-        <p>
-          Each transaction is recorded as a set of postings across sector accounts. The bookkeeping
-          rule is that the weighted sum of postings equals zero, where assets are positive and
-          liabilities and equity are negative. This enforces double-entry accounting across sectors.
-        </p>
-        <p>
-          The term “stock-flow consistent” means that every flow has a matching source and use, every
-          stock changes only through recorded flows, and all balance sheets satisfy the same accounting
-          identities at every step. This model explicitly enforces those identities.
-        </p>
-        <pre><code>Transaction balance:  Σ_i s_i · Δx_i = 0
-Account sign:          s_i = +1 (asset), -1 (liability/equity)
-Balance sheet:         Assets - Liabilities - Equity = 0
-Equity residual:       Equity = Assets - Liabilities</code></pre>
-        <p>
-          The identity Assets − Liabilities − Equity = 0 must hold because equity is defined as the
-          residual claim on assets after liabilities are subtracted. If a balance sheet violates this
-          identity, the records are inconsistent: either an asset or liability has been misrecorded, or
-          equity is not matching the net position. In this model, equity is recomputed each step as
-          Assets − Liabilities to guarantee consistency.
-        </p>
-      </section>
-
-      <section>
-        <h2>Plain-Language Glossary</h2>
-        <p>
-          This section explains the main terms without assuming any economics background.
-        </p>
-        <ul>
-          <li><strong>Sector</strong>: A group of accounts that move together. Here we use Private, Banks, Government (Treasury), and Central Bank.</li>
-          <li><strong>Asset</strong>: Something a sector owns or is owed. Example: your bank deposit is your asset.</li>
-          <li><strong>Liability</strong>: Something a sector owes. Example: a bank deposit is a bank liability because the bank owes the money to you.</li>
-          <li><strong>Equity (net worth)</strong>: The leftover value after paying liabilities. Equity = Assets − Liabilities.</li>
-          <li><strong>Deposit</strong>: Money in a bank account. It is an asset for the private sector and a liability for banks.</li>
-          <li><strong>Loan</strong>: A debt contract. It is an asset for the lender and a liability for the borrower.</li>
-          <li><strong>Reserves</strong>: The money banks hold at the central bank. It is an asset for banks and a liability for the central bank.</li>
-          <li><strong>Government bond</strong>: A promise by the government to repay later with interest. It is a liability for the government and an asset for whoever holds it.</li>
-          <li><strong>TGA (Treasury General Account)</strong>: The government’s checking account at the central bank. When taxes are paid, the TGA goes up.</li>
-          <li><strong>Money (M1)</strong>: A simple money measure here defined as deposits plus currency.</li>
-          <li><strong>Stock vs flow</strong>: A stock is a level (e.g., deposits). A flow is a change over time (e.g., spending per month).</li>
-          <li><strong>Stock-flow consistent (SFC)</strong>: Every flow is recorded, and all balance sheets always balance.</li>
-        </ul>
-      </section>
-
-      <section>
-        <h2>Money and Debt Dynamics</h2>
-        <p>
-          Money (M1) is defined as private deposits plus currency. Private debt corresponds to bank loans.
-          Loan creation expands both deposits and loans, while repayment contracts them. In accounting
-          terms, loans are a liability of the private sector and an asset of the banking sector, while
-          deposits are a liability of the banking sector and an asset of the private sector. For the
-          private sector this is the reverse view: deposits are assets, loans are liabilities.
-        </p>
-        <div class=\"figure\">{figures_html["money_debt"]}</div>
-      </section>
-
-      <section>
-        <h2>Simulation Step (Monthly)</h2>
-        <p>Each monthly step follows the same sequence:</p>
-        <ol>
-          <li>
-            Compute interest flows using current balances:
-            loan interest, deposit interest, reserve interest, and bond interest.
-          </li>
-          <li>
-            Compute policy flows:
-            government spending and taxes (taxes default to a rate on income flows).
-          </li>
-          <li>
-            Compute net loan change:
-            positive values create new loans and deposits; negative values repay loans.
-          </li>
-          <li>
-            Apply transactions in order:
-            loan creation/repayment, interest flows, government spending, and taxes.
-          </li>
-          <li>
-            Adjust government bond issuance to move the TGA toward its target level.
-          </li>
-          <li>
-            Recompute equity as residual and record a snapshot of all balances and metrics.
-          </li>
-        </ol>
-        <pre><code>Example flow identities (monthly):
-Interest on loans    = r_L · Loans
-Interest on deposits = r_D · Deposits
-Interest on reserves = r_R · Reserves
-Interest on bonds    = r_B · GovBonds</code></pre>
-        <pre><code>Default behavior rules:
-Loan change  = g_L · Loans
-Tax base     = G + i_D + i_B - i_L
-Taxes        = max(0, τ · Tax base)
-Bond issue   = TGA_target - TGA</code></pre>
-      </section>
-
-      <section>
-        <h2>Bank Reserves</h2>
-        <p>
-          Reserves are a liability of the central bank and an asset of commercial banks. Fiscal operations
-          and interest on reserves shift the reserve balance through the banking system.
-        </p>
-        <div class=\"figure\">{figures_html["bank_reserves"]}</div>
-      </section>
-
-      <section>
-        <h2>Bookkeeping Mechanics</h2>
-        <p>
-          Each flow is implemented as a balanced transaction. For example, government spending
-          credits private deposits and bank reserves, while debiting the government TGA and the
-          central bank's TGA liability. The transaction is balanced because asset increases are offset
-          by liability changes of equal magnitude.
-        </p>
-        <pre><code>Government spending (amount G):
-Private:      Deposits  +G  (asset)
-Banks:        Deposits  +G  (liability)
-Banks:        Reserves  +G  (asset)
-CentralBank:  Reserves  +G  (liability)
-CentralBank:  TGA       -G  (liability)
-Government:   TGA       -G  (asset)</code></pre>
-        <p>
-          Interpretation by sector:
-        </p>
-        <ul>
-          <li><strong>Central Bank:</strong> reserves (liability) increase and the TGA (liability) decreases by the same amount. Total CB liabilities are unchanged, so CB equity does not change.</li>
-          <li><strong>Treasury/Government:</strong> the TGA asset falls, reducing government net worth (equity). Government liabilities (bonds) are unchanged in this transaction.</li>
-          <li><strong>Banks:</strong> reserves (asset) rise and deposits (liability) rise by the same amount. Bank equity is unchanged.</li>
-          <li><strong>Private sector:</strong> deposits (asset) rise, so private equity increases.</li>
-        </ul>
-        <p>
-          The model also computes a sectoral identity check to verify that the non-government
-          sector's net financial assets equal the negative of the public sector's net position.
-        </p>
-        <pre><code>NonGov NFA = Private_NFA + Banks_NFA
-Public NFP = Government_NFP + CentralBank_NFP
-Identity check: NonGov NFA + Public NFP ≈ 0</code></pre>
-      </section>
-
-      <section>
-        <h2>Fiscal Flows</h2>
-        <p>
-          Government spending injects deposits into the private sector, while taxes withdraw them.
-          The model enforces double-entry bookkeeping for these flows.
-        </p>
-        <p>
-          Taxes reduce private deposits (an asset) and therefore reduce private equity (net worth).
-          On the banking side, tax payments settle by reducing bank reserves, while the Treasury's
-          TGA balance rises at the central bank. In short: taxes pull money out of deposits and
-          reserves and into the TGA; they do not add to reserves.
-        </p>
-        <pre><code>Taxes (amount T):
-Private:      Deposits  -T  (asset)
-Banks:        Deposits  -T  (liability)
-Banks:        Reserves  -T  (asset)
-CentralBank:  Reserves  -T  (liability)
-CentralBank:  TGA       +T  (liability)
-Government:   TGA       +T  (asset)</code></pre>
-        <p>Interpretation by sector:</p>
-        <ul>
-          <li><strong>Central Bank:</strong> reserves (liability) decrease and the TGA (liability) increases by the same amount. Total CB liabilities are unchanged, so CB equity does not change.</li>
-          <li><strong>Treasury/Government:</strong> the TGA asset rises, increasing government net worth (equity). Government liabilities (bonds) are unchanged in this transaction.</li>
-          <li><strong>Banks:</strong> reserves (asset) fall and deposits (liability) fall by the same amount. Bank equity is unchanged.</li>
-          <li><strong>Private sector:</strong> deposits (asset) fall, so private equity decreases.</li>
-        </ul>
-        <div class=\"figure\">{figures_html["fiscal_flows"]}</div>
-      </section>
-
-      <section>
-        <h2>Credit Creation and Bond Issuance</h2>
-        <p>
-          Credit creation is modeled as net loan change. Bond issuance adjusts the Treasury account toward
-          its target level, providing the financing counterpart to deficits.
-        </p>
-        <p>
-          The model can also include direct bond sales to the central bank (a simple QE-style operation).
-          In this case the Treasury issues bonds to the central bank and receives an increase in its TGA
-          balance. The central bank adds the bonds to its assets and records a matching TGA liability.
-          This is a swap within the public sector balance sheet and does not, by itself, change private
-          sector net worth.
-        </p>
-        <p>
-          Note: in many real-world jurisdictions, direct primary-market purchases of government bonds
-          by the central bank are restricted or prohibited by law. This model includes the flow as an
-          optional mechanism for exploration and bookkeeping clarity, not as a claim about legal
-          permissibility in any specific country.
-        </p>
-        <pre><code>Bond sale to Central Bank (amount B):
-Government:   GovBonds  +B  (liability)
-Government:   TGA       +B  (asset)
-CentralBank:  GovBonds  +B  (asset)
-CentralBank:  TGA       +B  (liability)</code></pre>
-        <div class=\"figure\">{figures_html["credit_bonds"]}</div>
-      </section>
-
-      <section>
-        <h2>Sectoral Net Financial Positions</h2>
-        <p>
-          In a closed economy with only financial assets, the non-government sector's net financial assets
-          are the mirror of the public sector's net position. This relationship should hold each step.
-        </p>
-        <div class=\"figure\">{figures_html["sectoral_positions"]}</div>
-      </section>
-
-      <section>
-        <h2>Accounting Check</h2>
-        <p>
-          The identity check should remain close to zero. Any deviation indicates a bookkeeping imbalance
-          or numerical drift.
-        </p>
-        <div class=\"figure\">{figures_html["accounting_check"]}</div>
-      </section>
-
-      <section>
-        <h2>Initial Conditions</h2>
-        <p>The model starts from the following balance sheet levels (defaults):</p>
-        <pre><code>{initial_json}</code></pre>
-      </section>
-
-      <section>
-        <h2>Model Parameters</h2>
-        <p>Default parameter values used for the simulation:</p>
-        <pre><code>{params_json}</code></pre>
-      </section>
-    </main>
-    <footer>
-      Generated by money-system simulation. Build time: {built_at}
-    </footer>
-  </body>
-</html>
-"""
+    return TEMPLATE.substitute(
+        initial_json=initial_json,
+        params_json=params_json,
+        built_at=built_at,
+    )
 
 
 def main() -> None:
@@ -373,14 +54,14 @@ def main() -> None:
     results = model.run()
 
     figures = build_figures(results.stocks, results.flows, results.metrics)
-    figures_html = render_figures_html(figures)
 
     args.output_dir.mkdir(parents=True, exist_ok=True)
-    (args.output_dir / "index.html").write_text(build_page(figures_html), encoding="utf-8")
+    dump_figures_json(figures, args.output_dir / "data.json")
+    (args.output_dir / "static").mkdir(exist_ok=True)
+    shutil.copyfile(STYLESHEET, args.output_dir / "static" / "style.css")
+    (args.output_dir / "index.html").write_text(build_page(), encoding="utf-8")
 
-    results.stocks.to_csv(args.output_dir / "stocks.csv", index=False)
-    results.flows.to_csv(args.output_dir / "flows.csv", index=False)
-    results.metrics.to_csv(args.output_dir / "metrics.csv", index=False)
+    write_results(results, args.output_dir, args.format)
 
 
 if __name__ == "__main__":
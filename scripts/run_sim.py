@@ -6,7 +6,9 @@ from pathlib import Path
 import matplotlib.pyplot as plt
 
 from money_system.config import ModelConfig
-from money_system.model import MoneySystemModel
+from money_system.interactive import write_cached_dashboard_html
+from money_system.io import FORMATS, write_results
+from money_system.model import FLOW_COLS, METRIC_COLS, MoneySystemModel, SimulationResults
 from money_system.plotting import LivePlotter, PlotStyle, plot_dashboard, plot_sector_balance_sheet
 
 
@@ -16,15 +18,24 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--output-dir", type=Path, default=Path("outputs"), help="Output directory")
     parser.add_argument("--no-plots", action="store_true", help="Disable plotting")
     parser.add_argument("--live", action="store_true", help="Enable live plotting")
+    parser.add_argument("--format", choices=FORMATS, default="csv", help="Output format for result tables")
+    parser.add_argument(
+        "--dashboard",
+        action="store_true",
+        help="Also write an interactive dashboard.html (reused when the results are unchanged)",
+    )
     return parser.parse_args()
 
 
-def run_static(model: MoneySystemModel, output_dir: Path) -> None:
+def write_outputs(results: SimulationResults, output_dir: Path, fmt: str, dashboard: bool) -> None:
+    write_results(results, output_dir, fmt)
+    if dashboard:
+        write_cached_dashboard_html(results.stocks, results.flows, results.metrics, output_dir / "dashboard.html")
+
+
+def run_static(model: MoneySystemModel, output_dir: Path, fmt: str = "csv", dashboard: bool = False) -> None:
     results = model.run()
-    output_dir.mkdir(parents=True, exist_ok=True)
-    results.stocks.to_csv(output_dir / "stocks.csv", index=False)
-    results.flows.to_csv(output_dir / "flows.csv", index=False)
-    results.metrics.to_csv(output_dir / "metrics.csv", index=False)
+    write_outputs(results, output_dir, fmt, dashboard)
 
     style = PlotStyle()
     fig = plot_dashboard(results.stocks, results.flows, results.metrics, style=style)
@@ -35,66 +46,40 @@ def run_static(model: MoneySystemModel, output_dir: Path) -> None:
         fig.savefig(output_dir / f"balance_sheet_{sector.lower()}.png", dpi=150)
 
 
-def run_live(model: MoneySystemModel, output_dir: Path) -> None:
+def run_live(model: MoneySystemModel, output_dir: Path, fmt: str = "csv", dashboard: bool = False) -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
     plotter = LivePlotter(
         {
             "metrics": ["Money_M1", "Private_Debt", "Bank_Reserves", "NonGov_NFA", "Public_NFP"],
             "flows": ["gov_spending", "taxes", "loan_change", "bond_issuance"],
-        }
+        },
+        columns={"metrics": METRIC_COLS, "flows": FLOW_COLS},
     )
 
     for step in range(model.config.steps):
         model.step(step)
-        plotter.update(
-            {
-                "metrics": _to_frame(model._metric_history),
-                "flows": _to_frame(model._flow_history),
-            }
-        )
+        plotter.update({"metrics": model._metric_hist, "flows": model._flow_hist}, step)
+    plotter.finalize()
 
     # Save outputs after the live run
-    results = model.run() if not model._stock_history else None
-    if results is None:
-        stocks_df = _to_frame(model._stock_history)
-        flows_df = _to_frame(model._flow_history)
-        metrics_df = _to_frame(model._metric_history)
-    else:
-        stocks_df = results.stocks
-        flows_df = results.flows
-        metrics_df = results.metrics
+    write_outputs(model.snapshot_frames(), output_dir, fmt, dashboard)
 
-    stocks_df.to_csv(output_dir / "stocks.csv", index=False)
-    flows_df.to_csv(output_dir / "flows.csv", index=False)
-    metrics_df.to_csv(output_dir / "metrics.csv", index=False)
-
-    plt.ioff()
     plt.show()
 
 
-def _to_frame(history):
-    import pandas as pd
-
-    return pd.DataFrame(history)
-
-
 def main() -> None:
     args = parse_args()
     config = ModelConfig(steps=args.steps)
     model = MoneySystemModel(config)
 
     if args.no_plots:
-        results = model.run()
-        args.output_dir.mkdir(parents=True, exist_ok=True)
-        results.stocks.to_csv(args.output_dir / "stocks.csv", index=False)
-        results.flows.to_csv(args.output_dir / "flows.csv", index=False)
-        results.metrics.to_csv(args.output_dir / "metrics.csv", index=False)
+        write_outputs(model.run(), args.output_dir, args.format, args.dashboard)
         return
 
     if args.live:
-        run_live(model, args.output_dir)
+        run_live(model, args.output_dir, args.format, args.dashboard)
     else:
-        run_static(model, args.output_dir)
+        run_static(model, args.output_dir, args.format, args.dashboard)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+from . import flows as _flows
+from . import ledger as _ledger
+from ._njit import njit
+from .config import ModelConfig
+from .flows import TX_TEMPLATES, TxKind
+from .ledger import CATEGORY_CODE, Ledger
+
+# Transaction kinds as plain ints for the kernel; pack_templates lays templates out in TxKind order.
+TX_LOAN_CREATION = int(TxKind.LOAN_CREATION)
+TX_LOAN_REPAYMENT = int(TxKind.LOAN_REPAYMENT)
+TX_PRIVATE_LOAN_CREATION = int(TxKind.PRIVATE_LOAN_CREATION)
+TX_PRIVATE_LOAN_REPAYMENT = int(TxKind.PRIVATE_LOAN_REPAYMENT)
+TX_INTEREST_ON_LOANS = int(TxKind.INTEREST_ON_LOANS)
+TX_INTEREST_ON_DEPOSITS = int(TxKind.INTEREST_ON_DEPOSITS)
+TX_INTEREST_ON_RESERVES = int(TxKind.INTEREST_ON_RESERVES)
+TX_INTEREST_ON_BONDS = int(TxKind.INTEREST_ON_BONDS)
+TX_GOVERNMENT_SPENDING = int(TxKind.GOVERNMENT_SPENDING)
+TX_TAXES = int(TxKind.TAXES)
+TX_BOND_SALE_TO_CB = int(TxKind.BOND_SALE_TO_CB)
+TX_BOND_ISSUE = int(TxKind.BOND_ISSUE)
+
+# Layout of the ``params`` vector. The kernel reads government spending from its own
+# per-step path; P_GOV_SPENDING is the constant callers fill that path with.
+P_GOV_SPENDING = 0
+P_TAX_RATE = 1
+P_LOAN_GROWTH = 2
+P_PRIVATE_LOAN_GROWTH = 3
+P_CB_BOND_PURCHASE = 4
+P_LOAN_RATE = 5
+P_DEPOSIT_RATE = 6
+P_RESERVE_RATE = 7
+P_BOND_RATE = 8
+P_TGA_TARGET = 9
+
+# Layout of the ``slots`` vector: state slots read by the behavior rules, then sector ids.
+S_PRIVATE_DEPOSITS = 0
+S_PRIVATE_CURRENCY = 1
+S_PRIVATE_LOANS = 2
+S_PRIVATE_LOANS_ASSET = 3
+S_PRIVATE_BONDS = 4
+S_BANK_RESERVES = 5
+S_GOVERNMENT_TGA = 6
+S_PRIVATE = 7
+S_BANKS = 8
+S_GOVERNMENT = 9
+S_CENTRAL_BANK = 10
+
+# Account categories in the ``cats`` vector: CATEGORY_CODE + 1, so 0 marks an unused slot.
+CAT_ASSET = CATEGORY_CODE["asset"] + 1
+CAT_LIABILITY = CATEGORY_CODE["liability"] + 1
+CAT_EQUITY = CATEGORY_CODE["equity"] + 1
+
+N_BASE_FLOWS = 10
+N_METRICS = 9
+# Upper bound on templates posted per step: eight behavior flows, the CB purchase and the bond issue.
+MAX_TX_PER_STEP = 10
+
+
+def pack_params(config: ModelConfig) -> np.ndarray:
+    return np.array(
+        [
+            config.gov_spending,
+            config.tax_rate,
+            config.loan_growth,
+            config.private_loan_growth,
+            config.cb_bond_purchase,
+            config.loan_rate,
+            config.deposit_rate,
+            config.reserve_rate,
+            config.bond_rate,
+            config.tga_target,
+        ],
+        dtype=np.float64,
+    )
+
+
+def pack_slots(ledger: Ledger) -> np.ndarray:
+    return np.array(
+        [
+            ledger.slot("Private", "Deposits"),
+            ledger.slot("Private", "Currency"),
+            ledger.slot("Private", "Loans"),
+            ledger.slot("Private", "PrivateLoansAsset"),
+            ledger.slot("Private", "GovBonds"),
+            ledger.slot("Banks", "Reserves"),
+            ledger.slot("Government", "TGA"),
+            ledger.sector_ids["Private"],
+            ledger.sector_ids["Banks"],
+            ledger.sector_ids["Government"],
+            ledger.sector_ids["CentralBank"],
+        ],
+        dtype=np.int64,
+    )
+
+
+def pack_categories(ledger: Ledger) -> np.ndarray:
+    return (ledger._cat_codes + 1).astype(np.int8)
+
+
+def pack_templates(n_accounts: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenate the templates in TxKind order into CSR form: (flat slots, signs, offsets)."""
+    templates = [TX_TEMPLATES[kind] for kind in TxKind]
+    offsets = np.zeros(len(templates) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(t) for t in templates])
+    stacked = np.concatenate(templates).astype(np.int64)
+    tpl_slots = stacked[:, 0] * n_accounts + stacked[:, 1]
+    tpl_signs = stacked[:, 2].astype(np.float64)
+    return tpl_slots, tpl_signs, offsets
+
+
+@njit(cache=True)
+def _post(state, tpl_slots, tpl_signs, tpl_offsets, tx, amount):
+    for k in range(tpl_offsets[tx], tpl_offsets[tx + 1]):
+        state[tpl_slots[k]] += tpl_signs[k] * amount
+
+
+@njit(cache=True)
+def _post_logged(
+    state, tpl_slots, tpl_signs, tpl_offsets, kinds, amounts, n_tx, log_kind, log_amount, log_step, n_logged, step
+):
+    """Post the first ``n_tx`` planned templates, skipping zero amounts like ``MoneySystemModel.step``.
+
+    Posted templates are appended to the log columns unless they are empty; returns the new log length.
+    """
+    for j in range(n_tx):
+        if amounts[j] == 0.0:
+            continue
+        _post(state, tpl_slots, tpl_signs, tpl_offsets, kinds[j], amounts[j])
+        if log_kind.size > 0:
+            log_kind[n_logged] = kinds[j]
+            log_amount[n_logged] = amounts[j]
+            log_step[n_logged] = step
+            n_logged += 1
+    return n_logged
+
+
+@njit(cache=True, fastmath=True)
+def run_steps(
+    state,
+    n_sectors,
+    n_accounts,
+    cats,
+    params,
+    gov_spending_path,
+    slots,
+    tpl_slots,
+    tpl_signs,
+    tpl_offsets,
+    stock_slots,
+    stock_out,
+    flow_out,
+    metric_out,
+    log_kind,
+    log_amount,
+    log_step,
+    n_steps,
+):
+    """Run ``n_steps`` monthly steps in place on ``state`` with the default behavior rules.
+
+    Government spending for step ``t`` is ``gov_spending_path[t]``, so a ``gov_spending_fn``
+    that only depends on the step can be evaluated up front. Posted templates are written to
+    the ``kind``/``amount``/``step`` columns of a TX_LOG_DTYPE buffer with room for
+    ``MAX_TX_PER_STEP * n_steps`` rows (empty arrays skip logging); returns the rows written.
+    """
+    nfa = np.zeros(n_sectors)
+    kinds = np.empty(MAX_TX_PER_STEP, dtype=np.int64)
+    amounts = np.empty(MAX_TX_PER_STEP)
+    n_logged = 0
+    for t in range(n_steps):
+        loans = state[slots[S_PRIVATE_LOANS]]
+        deposits = state[slots[S_PRIVATE_DEPOSITS]]
+        private_loans = state[slots[S_PRIVATE_LOANS_ASSET]]
+        bonds = state[slots[S_PRIVATE_BONDS]]
+        reserves = state[slots[S_BANK_RESERVES]]
+
+        gov_spending = gov_spending_path[t]
+        loan_change = params[P_LOAN_GROWTH] * loans
+        interest_loans = params[P_LOAN_RATE] * loans
+        interest_deposits = params[P_DEPOSIT_RATE] * deposits
+        interest_reserves = params[P_RESERVE_RATE] * reserves
+        interest_bonds = params[P_BOND_RATE] * bonds
+        private_loan_change = params[P_PRIVATE_LOAN_GROWTH] * private_loans
+        cb_bond_purchase = params[P_CB_BOND_PURCHASE]
+        tax_base = gov_spending + interest_deposits + interest_bonds - interest_loans
+        taxes = max(0.0, params[P_TAX_RATE] * tax_base)
+
+        if loan_change >= 0:
+            kinds[0] = TX_LOAN_CREATION
+            amounts[0] = loan_change
+        else:
+            kinds[0] = TX_LOAN_REPAYMENT
+            amounts[0] = min(-loan_change, deposits)
+        if private_loan_change >= 0:
+            kinds[1] = TX_PRIVATE_LOAN_CREATION
+            amounts[1] = private_loan_change
+        else:
+            kinds[1] = TX_PRIVATE_LOAN_REPAYMENT
+            amounts[1] = min(-private_loan_change, private_loans)
+        kinds[2] = TX_INTEREST_ON_LOANS
+        amounts[2] = interest_loans
+        kinds[3] = TX_INTEREST_ON_DEPOSITS
+        amounts[3] = interest_deposits
+        kinds[4] = TX_INTEREST_ON_RESERVES
+        amounts[4] = interest_reserves
+        kinds[5] = TX_INTEREST_ON_BONDS
+        amounts[5] = interest_bonds
+        kinds[6] = TX_GOVERNMENT_SPENDING
+        amounts[6] = gov_spending
+        kinds[7] = TX_TAXES
+        amounts[7] = taxes
+        n_tx = 8
+        if abs(cb_bond_purchase) > 1e-9:
+            kinds[8] = TX_BOND_SALE_TO_CB
+            amounts[8] = cb_bond_purchase
+            n_tx = 9
+        n_logged = _post_logged(
+            state, tpl_slots, tpl_signs, tpl_offsets, kinds, amounts, n_tx,
+            log_kind, log_amount, log_step, n_logged, t,
+        )
+
+        tga_gap = params[P_TGA_TARGET] - state[slots[S_GOVERNMENT_TGA]]
+        bond_issuance = 0.0
+        if abs(tga_gap) > 1e-6:
+            kinds[0] = TX_BOND_ISSUE
+            amounts[0] = tga_gap
+            n_logged = _post_logged(
+                state, tpl_slots, tpl_signs, tpl_offsets, kinds, amounts, 1,
+                log_kind, log_amount, log_step, n_logged, t,
+            )
+            bond_issuance = tga_gap
+
+        for s in range(n_sectors):
+            assets = 0.0
+            liabilities = 0.0
+            equity = 0.0
+            n_equity = 0
+            for a in range(s * n_accounts, (s + 1) * n_accounts):
+                if cats[a] == CAT_ASSET:
+                    assets += state[a]
+                elif cats[a] == CAT_LIABILITY:
+                    liabilities += state[a]
+                elif cats[a] == CAT_EQUITY:
+                    equity += state[a]
+                    n_equity += 1
+            nfa[s] = assets - liabilities
+            adjustment = 0.0
+            if n_equity > 0:
+                split = nfa[s] / n_equity
+                for a in range(s * n_accounts, (s + 1) * n_accounts):
+                    if cats[a] == CAT_EQUITY:
+                        state[a] = split
+                adjustment = split * n_equity - equity
+            flow_out[t, N_BASE_FLOWS + s] = adjustment
+
+        flow_out[t, 0] = gov_spending
+        flow_out[t, 1] = loan_change
+        flow_out[t, 2] = interest_loans
+        flow_out[t, 3] = interest_deposits
+        flow_out[t, 4] = interest_reserves
+        flow_out[t, 5] = interest_bonds
+        flow_out[t, 6] = private_loan_change
+        flow_out[t, 7] = cb_bond_purchase
+        flow_out[t, 8] = taxes
+        flow_out[t, 9] = bond_issuance
+
+        private_nfa = nfa[slots[S_PRIVATE]]
+        banks_nfa = nfa[slots[S_BANKS]]
+        public_nfp = nfa[slots[S_GOVERNMENT]] + nfa[slots[S_CENTRAL_BANK]]
+        metric_out[t, 0] = state[slots[S_PRIVATE_DEPOSITS]] + state[slots[S_PRIVATE_CURRENCY]]
+        metric_out[t, 1] = state[slots[S_PRIVATE_LOANS]]
+        metric_out[t, 2] = state[slots[S_PRIVATE_BONDS]]
+        metric_out[t, 3] = state[slots[S_BANK_RESERVES]]
+        metric_out[t, 4] = private_nfa
+        metric_out[t, 5] = banks_nfa
+        metric_out[t, 6] = private_nfa + banks_nfa
+        metric_out[t, 7] = public_nfp
+        metric_out[t, 8] = private_nfa + banks_nfa + public_nfp
+
+        for i in range(stock_slots.size):
+            stock_out[t, i] = state[stock_slots[i]]
+    return n_logged
+
+
+# Exported signature of the ahead-of-time build (scripts/build_kernels.py).
+RUN_STEPS_SIGNATURE = (
+    "i8(f8[:], i8, i8, i1[:], f8[:], f8[:], i8[:], i8[:], f8[:], i8[:], i8[:], f8[:, :], f8[:, :], f8[:, :], "
+    "u1[:], f8[:], i4[:], i8)"
+)
+
+
+def kernel_source_hash() -> int:
+    """Stamp of the kernel source, its signature and the modules its constants come from."""
+    digest = hashlib.blake2b(RUN_STEPS_SIGNATURE.encode(), digest_size=8)
+    for path in (Path(_flows.__file__), Path(_ledger.__file__), Path(__file__)):
+        digest.update(path.read_bytes())
+    return int.from_bytes(digest.digest(), "little", signed=True)
+
+
+try:  # Optional ahead-of-time build of run_steps: no JIT warm-up.
+    from ._aot_kernels import run_steps as aot_run_steps
+    from ._aot_kernels import source_hash as _aot_source_hash
+except ImportError:
+    aot_run_steps = None
+else:
+    # A build from older kernel source would fail on the new arguments or run stale step logic.
+    if _aot_source_hash() != kernel_source_hash():
+        aot_run_steps = None
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+import string
+from pathlib import Path
+
+# HTML shell of the GitHub Pages site, parsed once at import.
+TEMPLATE = string.Template((Path(__file__).with_name("site_template.html")).read_text(encoding="utf-8"))
+# Stylesheet copied verbatim to <output>/static/style.css.
+STYLESHEET = Path(__file__).with_name("site_style.css")
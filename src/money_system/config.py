@@ -4,6 +4,39 @@ from dataclasses import dataclass, field
 from typing import Callable, Dict
 
 
+_DEFAULT_INITIAL: Dict[str, Dict[str, float]] = {
+    "Private": {
+        "Deposits": 90.0,
+        "Loans": 100.0,
+        "PrivateLoansAsset": 0.0,
+        "PrivateLoansLiability": 0.0,
+        "GovBonds": 0.0,
+        "BankDebt": 0.0,
+        "Currency": 0.0,
+        "NetWorth": 0.0,
+    },
+    "Banks": {
+        "Loans": 100.0,
+        "Reserves": 0.0,
+        "Deposits": 90.0,
+        "BankDebt": 0.0,
+        "BankEquity": 0.0,
+    },
+    "Government": {
+        "TGA": 0.0,
+        "GovBonds": 0.0,
+        "GovEquity": 0.0,
+    },
+    "CentralBank": {
+        "Reserves": 0.0,
+        "Currency": 0.0,
+        "TGA": 0.0,
+        "GovBonds": 0.0,
+        "CBEq": 0.0,
+    },
+}
+
+
 @dataclass
 class ModelConfig:
     steps: int = 120
@@ -36,34 +69,4 @@ class ModelConfig:
     def resolve_initial(self) -> Dict[str, Dict[str, float]]:
         if self.initial:
             return self.initial
-        return {
-            "Private": {
-                "Deposits": 90.0,
-                "Loans": 100.0,
-                "PrivateLoansAsset": 0.0,
-                "PrivateLoansLiability": 0.0,
-                "GovBonds": 0.0,
-                "BankDebt": 0.0,
-                "Currency": 0.0,
-                "NetWorth": 0.0,
-            },
-            "Banks": {
-                "Loans": 100.0,
-                "Reserves": 0.0,
-                "Deposits": 90.0,
-                "BankDebt": 0.0,
-                "BankEquity": 0.0,
-            },
-            "Government": {
-                "TGA": 0.0,
-                "GovBonds": 0.0,
-                "GovEquity": 0.0,
-            },
-            "CentralBank": {
-                "Reserves": 0.0,
-                "Currency": 0.0,
-                "TGA": 0.0,
-                "GovBonds": 0.0,
-                "CBEq": 0.0,
-            },
-        }
+        return {sector: dict(accounts) for sector, accounts in _DEFAULT_INITIAL.items()}
@@ -1,219 +1,218 @@
 from __future__ import annotations
 
-from typing import List
-
-from .ledger import Posting, Transaction
-
-
-def tx_government_spending(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("gov_spending_zero", [])
-    return Transaction(
-        "government_spending",
-        [
-            Posting("Private", "Deposits", amount),
-            Posting("Banks", "Deposits", amount),
-            Posting("Banks", "Reserves", amount),
-            Posting("CentralBank", "Reserves", amount),
-            Posting("CentralBank", "TGA", -amount),
-            Posting("Government", "TGA", -amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_taxes(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("taxes_zero", [])
-    return Transaction(
-        "taxes",
-        [
-            Posting("Private", "Deposits", -amount),
-            Posting("Banks", "Deposits", -amount),
-            Posting("Banks", "Reserves", -amount),
-            Posting("CentralBank", "Reserves", -amount),
-            Posting("CentralBank", "TGA", amount),
-            Posting("Government", "TGA", amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_loan_creation(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("loan_creation_zero", [])
-    return Transaction(
-        "loan_creation",
-        [
-            Posting("Banks", "Loans", amount),
-            Posting("Private", "Loans", amount),
-            Posting("Banks", "Deposits", amount),
-            Posting("Private", "Deposits", amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_loan_repayment(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("loan_repayment_zero", [])
-    return Transaction(
-        "loan_repayment",
-        [
-            Posting("Private", "Deposits", -amount),
-            Posting("Banks", "Deposits", -amount),
-            Posting("Banks", "Loans", -amount),
-            Posting("Private", "Loans", -amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_private_loan_creation(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("private_loan_creation_zero", [])
-    return Transaction(
-        "private_loan_creation",
-        [
-            Posting("Private", "PrivateLoansAsset", amount),
-            Posting("Private", "PrivateLoansLiability", amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_private_loan_repayment(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("private_loan_repayment_zero", [])
-    return Transaction(
-        "private_loan_repayment",
-        [
-            Posting("Private", "PrivateLoansAsset", -amount),
-            Posting("Private", "PrivateLoansLiability", -amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_interest_on_loans(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("interest_loans_zero", [])
-    return Transaction(
-        "interest_on_loans",
-        [
-            Posting("Private", "Deposits", -amount),
-            Posting("Banks", "Deposits", -amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_interest_on_deposits(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("interest_deposits_zero", [])
-    return Transaction(
-        "interest_on_deposits",
-        [
-            Posting("Private", "Deposits", amount),
-            Posting("Banks", "Deposits", amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_interest_on_reserves(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("interest_reserves_zero", [])
-    return Transaction(
-        "interest_on_reserves",
-        [
-            Posting("Banks", "Reserves", amount),
-            Posting("CentralBank", "Reserves", amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_interest_on_bonds(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("interest_bonds_zero", [])
-    return Transaction(
-        "interest_on_bonds",
-        [
-            Posting("Private", "Deposits", amount),
-            Posting("Banks", "Deposits", amount),
-            Posting("Banks", "Reserves", amount),
-            Posting("CentralBank", "Reserves", amount),
-            Posting("CentralBank", "TGA", -amount),
-            Posting("Government", "TGA", -amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_bond_issue(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("bond_issue_zero", [])
-    return Transaction(
-        "bond_issue",
-        [
-            Posting("Private", "Deposits", -amount),
-            Posting("Banks", "Deposits", -amount),
-            Posting("Banks", "Reserves", -amount),
-            Posting("CentralBank", "Reserves", -amount),
-            Posting("CentralBank", "TGA", amount),
-            Posting("Government", "TGA", amount),
-            Posting("Government", "GovBonds", amount),
-            Posting("Private", "GovBonds", amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_bond_sale_to_cb(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("bond_sale_to_cb_zero", [])
-    return Transaction(
-        "bond_sale_to_cb",
-        [
-            Posting("Government", "GovBonds", amount),
-            Posting("CentralBank", "GovBonds", amount),
-            Posting("CentralBank", "TGA", amount),
-            Posting("Government", "TGA", amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_bank_debt_issue(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("bank_debt_issue_zero", [])
-    return Transaction(
-        "bank_debt_issue",
-        [
-            Posting("Private", "Deposits", -amount),
-            Posting("Banks", "Deposits", -amount),
-            Posting("Private", "BankDebt", amount),
-            Posting("Banks", "BankDebt", amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def tx_bank_debt_repayment(amount: float) -> Transaction:
-    if amount == 0:
-        return Transaction("bank_debt_repayment_zero", [])
-    return Transaction(
-        "bank_debt_repayment",
-        [
-            Posting("Private", "Deposits", amount),
-            Posting("Banks", "Deposits", amount),
-            Posting("Private", "BankDebt", -amount),
-            Posting("Banks", "BankDebt", -amount),
-        ],
-        meta={"amount": amount},
-    )
-
-
-def select_transactions(txs: List[Transaction]) -> List[Transaction]:
-    return [tx for tx in txs if tx.postings]
+from enum import IntEnum
+from typing import Dict, Iterable, Iterator, Tuple
+
+import numpy as np
+
+from .ledger import ACCOUNTS, CATEGORY_SIGN, CHART, SECTORS, AccountId, Sector, TemplateTx
+
+
+def _template(*postings: Tuple[Sector, AccountId, int]) -> np.ndarray:
+    imbalance = sum(sign * CATEGORY_SIGN[CHART[SECTORS[s]][ACCOUNTS[a]]] for s, a, sign in postings)
+    if imbalance != 0:
+        raise ValueError(f"Posting template unbalanced by {imbalance}: {postings}")
+    return np.array(postings, dtype=np.int32)
+
+
+class TxKind(IntEnum):
+    LOAN_CREATION = 0
+    LOAN_REPAYMENT = 1
+    PRIVATE_LOAN_CREATION = 2
+    PRIVATE_LOAN_REPAYMENT = 3
+    INTEREST_ON_LOANS = 4
+    INTEREST_ON_DEPOSITS = 5
+    INTEREST_ON_RESERVES = 6
+    INTEREST_ON_BONDS = 7
+    GOVERNMENT_SPENDING = 8
+    TAXES = 9
+    BOND_SALE_TO_CB = 10
+    BOND_ISSUE = 11
+    BANK_DEBT_ISSUE = 12
+    BANK_DEBT_REPAYMENT = 13
+
+
+# Posting templates as (sector_id, account_id, sign) rows; a transaction is a template scaled by an amount.
+TX_TEMPLATES: Dict[TxKind, np.ndarray] = {
+    TxKind.GOVERNMENT_SPENDING: _template(
+        (Sector.PRIVATE, AccountId.DEPOSITS, +1),
+        (Sector.BANKS, AccountId.DEPOSITS, +1),
+        (Sector.BANKS, AccountId.RESERVES, +1),
+        (Sector.CENTRAL_BANK, AccountId.RESERVES, +1),
+        (Sector.CENTRAL_BANK, AccountId.TGA, -1),
+        (Sector.GOVERNMENT, AccountId.TGA, -1),
+    ),
+    TxKind.TAXES: _template(
+        (Sector.PRIVATE, AccountId.DEPOSITS, -1),
+        (Sector.BANKS, AccountId.DEPOSITS, -1),
+        (Sector.BANKS, AccountId.RESERVES, -1),
+        (Sector.CENTRAL_BANK, AccountId.RESERVES, -1),
+        (Sector.CENTRAL_BANK, AccountId.TGA, +1),
+        (Sector.GOVERNMENT, AccountId.TGA, +1),
+    ),
+    TxKind.LOAN_CREATION: _template(
+        (Sector.BANKS, AccountId.LOANS, +1),
+        (Sector.PRIVATE, AccountId.LOANS, +1),
+        (Sector.BANKS, AccountId.DEPOSITS, +1),
+        (Sector.PRIVATE, AccountId.DEPOSITS, +1),
+    ),
+    TxKind.LOAN_REPAYMENT: _template(
+        (Sector.PRIVATE, AccountId.DEPOSITS, -1),
+        (Sector.BANKS, AccountId.DEPOSITS, -1),
+        (Sector.BANKS, AccountId.LOANS, -1),
+        (Sector.PRIVATE, AccountId.LOANS, -1),
+    ),
+    TxKind.PRIVATE_LOAN_CREATION: _template(
+        (Sector.PRIVATE, AccountId.PRIVATE_LOANS_ASSET, +1),
+        (Sector.PRIVATE, AccountId.PRIVATE_LOANS_LIABILITY, +1),
+    ),
+    TxKind.PRIVATE_LOAN_REPAYMENT: _template(
+        (Sector.PRIVATE, AccountId.PRIVATE_LOANS_ASSET, -1),
+        (Sector.PRIVATE, AccountId.PRIVATE_LOANS_LIABILITY, -1),
+    ),
+    TxKind.INTEREST_ON_LOANS: _template(
+        (Sector.PRIVATE, AccountId.DEPOSITS, -1),
+        (Sector.BANKS, AccountId.DEPOSITS, -1),
+    ),
+    TxKind.INTEREST_ON_DEPOSITS: _template(
+        (Sector.PRIVATE, AccountId.DEPOSITS, +1),
+        (Sector.BANKS, AccountId.DEPOSITS, +1),
+    ),
+    TxKind.INTEREST_ON_RESERVES: _template(
+        (Sector.BANKS, AccountId.RESERVES, +1),
+        (Sector.CENTRAL_BANK, AccountId.RESERVES, +1),
+    ),
+    TxKind.INTEREST_ON_BONDS: _template(
+        (Sector.PRIVATE, AccountId.DEPOSITS, +1),
+        (Sector.BANKS, AccountId.DEPOSITS, +1),
+        (Sector.BANKS, AccountId.RESERVES, +1),
+        (Sector.CENTRAL_BANK, AccountId.RESERVES, +1),
+        (Sector.CENTRAL_BANK, AccountId.TGA, -1),
+        (Sector.GOVERNMENT, AccountId.TGA, -1),
+    ),
+    TxKind.BOND_ISSUE: _template(
+        (Sector.PRIVATE, AccountId.DEPOSITS, -1),
+        (Sector.BANKS, AccountId.DEPOSITS, -1),
+        (Sector.BANKS, AccountId.RESERVES, -1),
+        (Sector.CENTRAL_BANK, AccountId.RESERVES, -1),
+        (Sector.CENTRAL_BANK, AccountId.TGA, +1),
+        (Sector.GOVERNMENT, AccountId.TGA, +1),
+        (Sector.GOVERNMENT, AccountId.GOV_BONDS, +1),
+        (Sector.PRIVATE, AccountId.GOV_BONDS, +1),
+    ),
+    TxKind.BOND_SALE_TO_CB: _template(
+        (Sector.GOVERNMENT, AccountId.GOV_BONDS, +1),
+        (Sector.CENTRAL_BANK, AccountId.GOV_BONDS, +1),
+        (Sector.CENTRAL_BANK, AccountId.TGA, +1),
+        (Sector.GOVERNMENT, AccountId.TGA, +1),
+    ),
+    TxKind.BANK_DEBT_ISSUE: _template(
+        (Sector.PRIVATE, AccountId.DEPOSITS, -1),
+        (Sector.BANKS, AccountId.DEPOSITS, -1),
+        (Sector.PRIVATE, AccountId.BANK_DEBT, +1),
+        (Sector.BANKS, AccountId.BANK_DEBT, +1),
+    ),
+    TxKind.BANK_DEBT_REPAYMENT: _template(
+        (Sector.PRIVATE, AccountId.DEPOSITS, +1),
+        (Sector.BANKS, AccountId.DEPOSITS, +1),
+        (Sector.PRIVATE, AccountId.BANK_DEBT, -1),
+        (Sector.BANKS, AccountId.BANK_DEBT, -1),
+    ),
+}
+
+if set(TX_TEMPLATES) != set(TxKind):
+    raise ValueError("TX_TEMPLATES must define exactly one template per TxKind")
+
+# Plain-int copies of the templates indexed by TxKind, for the Python step loop:
+# iterating a few tuples is much cheaper than fancy-indexing with tiny arrays.
+TX_TABLE: Tuple[Tuple[Tuple[int, int, int], ...], ...] = tuple(
+    tuple(tuple(row) for row in TX_TEMPLATES[kind].tolist()) for kind in TxKind
+)
+
+
+def tx_government_spending(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.GOVERNMENT_SPENDING, TX_TABLE[TxKind.GOVERNMENT_SPENDING], amount
+
+
+def tx_taxes(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.TAXES, TX_TABLE[TxKind.TAXES], amount
+
+
+def tx_loan_creation(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.LOAN_CREATION, TX_TABLE[TxKind.LOAN_CREATION], amount
+
+
+def tx_loan_repayment(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.LOAN_REPAYMENT, TX_TABLE[TxKind.LOAN_REPAYMENT], amount
+
+
+def tx_private_loan_creation(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.PRIVATE_LOAN_CREATION, TX_TABLE[TxKind.PRIVATE_LOAN_CREATION], amount
+
+
+def tx_private_loan_repayment(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.PRIVATE_LOAN_REPAYMENT, TX_TABLE[TxKind.PRIVATE_LOAN_REPAYMENT], amount
+
+
+def tx_interest_on_loans(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.INTEREST_ON_LOANS, TX_TABLE[TxKind.INTEREST_ON_LOANS], amount
+
+
+def tx_interest_on_deposits(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.INTEREST_ON_DEPOSITS, TX_TABLE[TxKind.INTEREST_ON_DEPOSITS], amount
+
+
+def tx_interest_on_reserves(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.INTEREST_ON_RESERVES, TX_TABLE[TxKind.INTEREST_ON_RESERVES], amount
+
+
+def tx_interest_on_bonds(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.INTEREST_ON_BONDS, TX_TABLE[TxKind.INTEREST_ON_BONDS], amount
+
+
+def tx_bond_issue(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.BOND_ISSUE, TX_TABLE[TxKind.BOND_ISSUE], amount
+
+
+def tx_bond_sale_to_cb(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.BOND_SALE_TO_CB, TX_TABLE[TxKind.BOND_SALE_TO_CB], amount
+
+
+def tx_bank_debt_issue(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.BANK_DEBT_ISSUE, TX_TABLE[TxKind.BANK_DEBT_ISSUE], amount
+
+
+def tx_bank_debt_repayment(amount: float) -> TemplateTx | None:
+    if amount == 0.0:
+        return None
+    return TxKind.BANK_DEBT_REPAYMENT, TX_TABLE[TxKind.BANK_DEBT_REPAYMENT], amount
+
+
+def select_transactions(txs: Iterable[TemplateTx | None]) -> Iterator[TemplateTx]:
+    return (tx for tx in txs if tx is not None)
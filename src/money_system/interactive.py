@@ -1,12 +1,32 @@
 from __future__ import annotations
 
+import glob
+import hashlib
+import json
+import shutil
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Sequence
+from typing import Dict, List, Sequence
 
+import numpy as np
 import pandas as pd
+import plotly
 import plotly.graph_objects as go
 import plotly.io as pio
+from plotly.subplots import make_subplots
+from plotly.utils import PlotlyJSONEncoder
+
+
+@dataclass
+class InteractiveLayout:
+    # Traces longer than this are downsampled to evenly spaced rows; WebGL rendering and JSON size then
+    # scale with the display, not the simulation length.
+    max_points: int = 5000
+    panel_height: int = 300
+
+    def __post_init__(self) -> None:
+        if self.max_points <= 0:
+            raise ValueError(f"max_points must be positive, got {self.max_points}")
 
 
 @dataclass
@@ -18,12 +38,71 @@ class FigureSpec:
     dataset: str
 
 
-def _build_figure(df: pd.DataFrame, columns: Sequence[str], title: str, yaxis: str) -> go.Figure:
-    fig = go.Figure()
-    for name in columns:
-        if name not in df.columns:
-            continue
-        fig.add_trace(go.Scatter(x=list(df.index), y=df[name], mode="lines", name=name))
+FIGURE_SPECS: List[FigureSpec] = [
+    FigureSpec(
+        name="money_debt",
+        title="Money and Private Debt",
+        columns=["Money_M1", "Private_Debt"],
+        yaxis_title="Level",
+        dataset="metrics",
+    ),
+    FigureSpec(
+        name="bank_reserves",
+        title="Bank Reserves",
+        columns=["Bank_Reserves"],
+        yaxis_title="Level",
+        dataset="metrics",
+    ),
+    FigureSpec(
+        name="fiscal_flows",
+        title="Fiscal Flows",
+        columns=["gov_spending", "taxes"],
+        yaxis_title="Flow",
+        dataset="flows",
+    ),
+    FigureSpec(
+        name="credit_bonds",
+        title="Credit Creation and Bond Issuance",
+        columns=["loan_change", "bond_issuance"],
+        yaxis_title="Flow",
+        dataset="flows",
+    ),
+    FigureSpec(
+        name="sectoral_positions",
+        title="Sectoral Net Financial Positions",
+        columns=["NonGov_NFA", "Public_NFP"],
+        yaxis_title="Level",
+        dataset="metrics",
+    ),
+    FigureSpec(
+        name="accounting_check",
+        title="Accounting Check (should be ~0)",
+        columns=["Sector_Balance_Check"],
+        yaxis_title="Level",
+        dataset="metrics",
+    ),
+]
+
+
+def _series_traces(df: pd.DataFrame, columns: Sequence[str], max_points: int) -> List[go.Scattergl]:
+    names = [name for name in columns if name in df.columns]
+    # At most max_points evenly spaced rows, counted back from the last so the final step is always shown.
+    n = len(df)
+    rows = np.linspace(n - 1, 0, num=min(n, max_points)).round().astype(np.intp)[::-1]
+    x = df.index.to_numpy()[rows]
+    # One ndarray gather for all series; each trace gets a column view.
+    arr = df.to_numpy()[np.ix_(rows, df.columns.get_indexer(names))]
+    return [go.Scattergl(x=x, y=arr[:, k], mode="lines", name=name) for k, name in enumerate(names)]
+
+
+def _build_figure(
+    df: pd.DataFrame,
+    columns: Sequence[str],
+    title: str,
+    yaxis: str,
+    layout: InteractiveLayout,
+) -> go.Figure:
+    fig = go.Figure(data=_series_traces(df, columns, layout.max_points))
     fig.update_layout(title=title, xaxis_title="Step", yaxis_title=yaxis, legend_title_text="Series")
     return fig
 
@@ -32,52 +111,10 @@ def build_figures(
     stocks: pd.DataFrame,
     flows: pd.DataFrame,
     metrics: pd.DataFrame,
+    layout: InteractiveLayout | None = None,
 ) -> Dict[str, go.Figure]:
-    specs = [
-        FigureSpec(
-            name="money_debt",
-            title="Money and Private Debt",
-            columns=["Money_M1", "Private_Debt"],
-            yaxis_title="Level",
-            dataset="metrics",
-        ),
-        FigureSpec(
-            name="bank_reserves",
-            title="Bank Reserves",
-            columns=["Bank_Reserves"],
-            yaxis_title="Level",
-            dataset="metrics",
-        ),
-        FigureSpec(
-            name="fiscal_flows",
-            title="Fiscal Flows",
-            columns=["gov_spending", "taxes"],
-            yaxis_title="Flow",
-            dataset="flows",
-        ),
-        FigureSpec(
-            name="credit_bonds",
-            title="Credit Creation and Bond Issuance",
-            columns=["loan_change", "bond_issuance"],
-            yaxis_title="Flow",
-            dataset="flows",
-        ),
-        FigureSpec(
-            name="sectoral_positions",
-            title="Sectoral Net Financial Positions",
-            columns=["NonGov_NFA", "Public_NFP"],
-            yaxis_title="Level",
-            dataset="metrics",
-        ),
-        FigureSpec(
-            name="accounting_check",
-            title="Accounting Check (should be ~0)",
-            columns=["Sector_Balance_Check"],
-            yaxis_title="Level",
-            dataset="metrics",
-        ),
-    ]
-
+    if layout is None:
+        layout = InteractiveLayout()
     datasets = {
         "stocks": stocks,
         "flows": flows,
@@ -85,12 +122,46 @@ def build_figures(
     }
 
     figures: Dict[str, go.Figure] = {}
-    for spec in specs:
+    for spec in FIGURE_SPECS:
         df = datasets[spec.dataset]
-        figures[spec.name] = _build_figure(df, spec.columns, spec.title, spec.yaxis_title)
+        figures[spec.name] = _build_figure(df, spec.columns, spec.title, spec.yaxis_title, layout)
     return figures
 
 
+def build_dashboard(
+    stocks: pd.DataFrame,
+    flows: pd.DataFrame,
+    metrics: pd.DataFrame,
+    layout: InteractiveLayout | None = None,
+) -> go.Figure:
+    """All panels as one figure with a shared x-axis, emitted as a single Plotly div."""
+    if layout is None:
+        layout = InteractiveLayout()
+    datasets = {
+        "stocks": stocks,
+        "flows": flows,
+        "metrics": metrics,
+    }
+    fig = make_subplots(
+        rows=len(FIGURE_SPECS),
+        cols=1,
+        shared_xaxes=True,
+        subplot_titles=[spec.title for spec in FIGURE_SPECS],
+    )
+    # Collect every trace first and add them in one batch: each add_trace call re-validates the figure.
+    traces: List[go.Scattergl] = []
+    rows: List[int] = []
+    for row, spec in enumerate(FIGURE_SPECS, start=1):
+        panel = _series_traces(datasets[spec.dataset], spec.columns, layout.max_points)
+        traces.extend(panel)
+        rows.extend([row] * len(panel))
+        fig.update_yaxes(title_text=spec.yaxis_title, row=row, col=1)
+    fig.add_traces(traces, rows=rows, cols=[1] * len(traces))
+    fig.update_xaxes(title_text="Step", row=len(FIGURE_SPECS), col=1)
+    fig.update_layout(height=layout.panel_height * len(FIGURE_SPECS), legend_title_text="Series")
+    return fig
+
+
 def render_figures_html(figures: Dict[str, go.Figure]) -> Dict[str, str]:
     rendered: Dict[str, str] = {}
     for name, fig in figures.items():
@@ -98,6 +169,47 @@ def render_figures_html(figures: Dict[str, go.Figure]) -> Dict[str, str]:
     return rendered
 
 
+def dump_figures_json(figures: Dict[str, go.Figure], path: Path) -> None:
+    """Write all figures as one JSON document keyed by name, for client-side ``Plotly.newPlot``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {name: fig.to_plotly_json() for name, fig in figures.items()}
+    path.write_text(json.dumps(payload, cls=PlotlyJSONEncoder), encoding="utf-8")
+
+
 def write_dashboard_html(fig: go.Figure, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     fig.write_html(path, include_plotlyjs="cdn", full_html=True)
+
+
+def _results_digest(frames: Sequence[pd.DataFrame], layout: InteractiveLayout) -> str:
+    # The plotly version decides the embedded JS and the trace encoding, so it keys the render too.
+    digest = hashlib.blake2b(repr((plotly.__version__, FIGURE_SPECS, layout)).encode(), digest_size=8)
+    for df in frames:
+        digest.update(repr(list(df.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(df.index).to_numpy().tobytes())
+        digest.update(df.to_numpy(dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def write_cached_dashboard_html(
+    stocks: pd.DataFrame,
+    flows: pd.DataFrame,
+    metrics: pd.DataFrame,
+    path: Path,
+    layout: InteractiveLayout | None = None,
+) -> Path:
+    """Write the dashboard for these results to ``path``, reusing a previous render of identical data.
+
+    Renders are kept next to ``path`` as ``<stem>.<hash>.html``; returns the cache file used.
+    Writing a new render deletes the older ones, so only the latest is kept.
+    """
+    if layout is None:
+        layout = InteractiveLayout()
+    digest = _results_digest((stocks, flows, metrics), layout)
+    cached = path.with_suffix(f".{digest}.html")
+    if not cached.exists():
+        for stale in path.parent.glob(f"{glob.escape(path.stem)}.{'[0-9a-f]' * len(digest)}.html"):
+            stale.unlink()
+        write_dashboard_html(build_dashboard(stocks, flows, metrics, layout), cached)
+    shutil.copyfile(cached, path)
+    return cached
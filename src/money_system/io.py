@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as pa_feather
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # pyarrow is optional and only needed for the columnar formats.
+    pa = None
+
+if TYPE_CHECKING:
+    from .model import SimulationResults
+
+FORMATS = ("csv", "parquet", "feather")
+
+
+def _repr_or_empty(value: float) -> str:
+    return "" if value != value else repr(value)
+
+
+def fast_numeric_to_csv(df: pd.DataFrame, path: Path) -> None:
+    """Write a float-only frame without its index, bypassing pandas' row-wise formatter.
+
+    The output is the same as ``df.to_csv(index=False)``: values are formatted with ``repr``
+    (``101.0``, ``90.74166666666667``) and NaN is written as an empty field.
+    """
+    arr = df.to_numpy(dtype=np.float64, copy=False)
+    fmt = _repr_or_empty if np.isnan(arr).any() else repr
+    lines = [",".join(df.columns)]
+    lines.extend(",".join(map(fmt, row)) for row in arr.tolist())
+    lines.append("")
+    with open(path, "w", newline="") as fh:
+        fh.write("\n".join(lines))
+
+
+def _check_format(fmt: str, action: str) -> None:
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format '{fmt}', expected one of {FORMATS}")
+    if fmt != "csv" and pa is None:
+        raise ImportError(f"{action} {fmt} output requires pyarrow")
+
+
+def write_results(results: SimulationResults, output_dir: Path, fmt: str = "csv") -> None:
+    """Write stocks, flows and metrics to ``output_dir`` as ``<name>.<fmt>``."""
+    _check_format(fmt, "Writing")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name, df in (("stocks", results.stocks), ("flows", results.flows), ("metrics", results.metrics)):
+        path = output_dir / f"{name}.{fmt}"
+        if fmt == "csv":
+            fast_numeric_to_csv(df, path)
+            continue
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if fmt == "parquet":
+            pa_parquet.write_table(table, path, compression="zstd")
+        else:
+            pa_feather.write_feather(table, path)
+
+
+def read_results(input_dir: Path, fmt: str = "csv") -> Dict[str, pd.DataFrame]:
+    """Read the ``stocks``, ``flows`` and ``metrics`` frames written by ``write_results``."""
+    _check_format(fmt, "Reading")
+    frames: Dict[str, pd.DataFrame] = {}
+    for name in ("stocks", "flows", "metrics"):
+        path = Path(input_dir) / f"{name}.{fmt}"
+        if fmt == "csv":
+            if pa is not None:
+                frames[name] = pd.read_csv(path, engine="pyarrow", dtype=np.float64)
+            else:
+                frames[name] = pd.read_csv(path, dtype=np.float64, float_precision="round_trip")
+        elif fmt == "parquet":
+            frames[name] = pa_parquet.read_table(path).to_pandas()
+        else:
+            frames[name] = pa_feather.read_table(path).to_pandas()
+    return frames
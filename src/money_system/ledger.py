@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+import numpy as np
 
 
 CATEGORY_SIGN = {
@@ -9,41 +14,185 @@ CATEGORY_SIGN = {
     "liability": -1.0,
     "equity": -1.0,
 }
+# Small-int category codes; _SIGN_ARR[code] is the category's sign.
+CATEGORY_CODE = {"asset": 0, "liability": 1, "equity": 2}
+_SIGN_ARR = np.array([CATEGORY_SIGN[category] for category in CATEGORY_CODE])
+
+# Chart of accounts: sector -> account -> category.
+CHART: Dict[str, Dict[str, str]] = {
+    "Private": {
+        "Deposits": "asset",
+        "Loans": "liability",
+        "PrivateLoansAsset": "asset",
+        "PrivateLoansLiability": "liability",
+        "GovBonds": "asset",
+        "BankDebt": "asset",
+        "Currency": "asset",
+        "NetWorth": "equity",
+    },
+    "Banks": {
+        "Loans": "asset",
+        "Reserves": "asset",
+        "Deposits": "liability",
+        "BankDebt": "liability",
+        "BankEquity": "equity",
+    },
+    "Government": {
+        "TGA": "asset",
+        "GovBonds": "liability",
+        "GovEquity": "equity",
+    },
+    "CentralBank": {
+        "Reserves": "liability",
+        "Currency": "liability",
+        "TGA": "liability",
+        "GovBonds": "asset",
+        "CBEq": "equity",
+    },
+}
+
+# Index layout of the flat ledger state: slot = sector_id * N_ACCT + account_id.
+SECTORS: Tuple[str, ...] = tuple(CHART)
+ACCOUNTS: Tuple[str, ...] = tuple(dict.fromkeys(a for accounts in CHART.values() for a in accounts))
+N_ACCT = len(ACCOUNTS)
+
+
+class Sector(IntEnum):
+    PRIVATE = 0
+    BANKS = 1
+    GOVERNMENT = 2
+    CENTRAL_BANK = 3
+
+
+class AccountId(IntEnum):
+    DEPOSITS = 0
+    LOANS = 1
+    PRIVATE_LOANS_ASSET = 2
+    PRIVATE_LOANS_LIABILITY = 3
+    GOV_BONDS = 4
+    BANK_DEBT = 5
+    CURRENCY = 6
+    NET_WORTH = 7
+    RESERVES = 8
+    BANK_EQUITY = 9
+    TGA = 10
+    GOV_EQUITY = 11
+    CB_EQ = 12
+
+
+def _enum_name(name: str) -> str:
+    # "CentralBank" -> "CENTRAL_BANK", "CBEq" -> "CB_EQ"
+    return re.sub(r"(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])", "_", name).upper()
+
+
+# Templates address slots through these enums, so a reordered or renamed CHART entry must not import.
+if [m.name for m in Sector] != [_enum_name(name) for name in SECTORS] or [m.name for m in AccountId] != [
+    _enum_name(name) for name in ACCOUNTS
+]:
+    raise ValueError("Sector/AccountId enums are out of sync with CHART")
+
+# (kind, postings, amount) as returned by the builders in flows.py; kind is a
+# flows.TxKind and postings are its (sector_id, account_id, sign) triples.
+TemplateTx = Tuple[int, Tuple[Tuple[int, int, int], ...], float]
+
+# One row of the posted-template log: transaction kind, amount and the step it was posted in.
+# Aligned so the field views can be handed to the compiled kernel as ordinary arrays.
+TX_LOG_DTYPE = np.dtype([("kind", "u1"), ("amount", "f8"), ("step", "i4")], align=True)
 
 
-@dataclass
 class Account:
-    name: str
-    category: str
-    balance: float = 0.0
+    """A single account. Once adopted by a Ledger its balance lives in the ledger state vector."""
+
+    def __init__(self, name: str, category: str, balance: float = 0.0):
+        self.name = name
+        self.category = category
+        self.cat_code = CATEGORY_CODE[category]
+        self._store = np.array([balance], dtype=np.float64)
+        self._slot = 0
+
+    def __repr__(self) -> str:
+        return f"Account(name={self.name!r}, category={self.category!r}, balance={self.balance!r})"
+
+    def __eq__(self, other: object) -> bool:
+        # Value equality like the former dataclass, independent of where the balance is stored.
+        if not isinstance(other, Account):
+            return NotImplemented
+        return (self.name, self.category, self.balance) == (other.name, other.category, other.balance)
+
+    __hash__ = None
+
+    @property
+    def balance(self) -> float:
+        return float(self._store[self._slot])
+
+    @balance.setter
+    def balance(self, value: float) -> None:
+        self._store[self._slot] = value
+
+    def bind(self, store: np.ndarray, slot: int) -> None:
+        store[slot] = self._store[self._slot]
+        self._store = store
+        self._slot = slot
 
     def apply(self, delta: float) -> None:
-        self.balance += delta
+        self._store[self._slot] += delta
 
 
 @dataclass
 class SectorLedger:
     name: str
     accounts: Dict[str, Account] = field(default_factory=dict)
+    # Set by bind(): the ledger state plus the slots of this sector's accounts per category,
+    # as plain lists since a scalar loop over a few slots beats a fancy-indexed sum.
+    # Excluded from __eq__, so sectors compare by name and account values only.
+    _store: np.ndarray | None = field(default=None, init=False, repr=False, compare=False)
+    _asset_slots: List[int] | None = field(default=None, init=False, repr=False, compare=False)
+    _liab_slots: List[int] | None = field(default=None, init=False, repr=False, compare=False)
+    _equity_slots: List[int] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def bind(self, store: np.ndarray, slots: Dict[str, int]) -> None:
+        """Compute totals from ``store`` at the given account slots instead of iterating accounts."""
+        by_category: Dict[str, List[int]] = {"asset": [], "liability": [], "equity": []}
+        for account in self.accounts.values():
+            by_category[account.category].append(slots[account.name])
+        self._asset_slots = by_category["asset"]
+        self._liab_slots = by_category["liability"]
+        self._equity_slots = by_category["equity"]
+        self._store = store
 
     def apply(self, account_name: str, delta: float) -> None:
         if account_name not in self.accounts:
             raise KeyError(f"Unknown account '{account_name}' in sector '{self.name}'")
         self.accounts[account_name].apply(delta)
 
+    def _total(self, category: str, slots: List[int] | None) -> float:
+        if self._store is None:
+            return sum(a.balance for a in self.accounts.values() if a.category == category)
+        item = self._store.item
+        total = 0.0
+        for slot in slots:
+            total += item(slot)
+        return total
+
     def assets_total(self) -> float:
-        return sum(a.balance for a in self.accounts.values() if a.category == "asset")
+        return self._total("asset", self._asset_slots)
 
     def liabilities_total(self) -> float:
-        return sum(a.balance for a in self.accounts.values() if a.category == "liability")
+        return self._total("liability", self._liab_slots)
 
     def equity_total(self) -> float:
-        return sum(a.balance for a in self.accounts.values() if a.category == "equity")
+        return self._total("equity", self._equity_slots)
 
     def net_position(self) -> float:
         return self.assets_total() - self.liabilities_total()
 
     def recompute_equity(self) -> None:
+        if self._store is not None:
+            if self._equity_slots:
+                split = self.net_position() / len(self._equity_slots)
+                for slot in self._equity_slots:
+                    self._store[slot] = split
+            return
         equity_accounts = [a for a in self.accounts.values() if a.category == "equity"]
         if not equity_accounts:
             return
@@ -62,32 +211,69 @@ class SectorLedger:
             )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Posting:
     sector: str
     account: str
     amount: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Transaction:
     name: str
-    postings: List[Posting]
+    postings: Tuple[Posting, ...]
     meta: Dict[str, float] = field(default_factory=dict)
 
     def total(self, ledger: "Ledger") -> float:
+        # Transactions have a handful of postings; a scalar loop beats building arrays.
         total = 0.0
         for p in self.postings:
-            account = ledger.sectors[p.sector].accounts[p.account]
-            sign = CATEGORY_SIGN[account.category]
-            total += p.amount * sign
+            total += p.amount * ledger._slot_sign[ledger._idx[(p.sector, p.account)]]
         return total
 
 
+def _layout(names: Iterable[str], known: Tuple[str, ...]) -> Dict[str, int]:
+    # Known names keep their module-level ids so templates index any ledger correctly.
+    order = list(known) + [n for n in dict.fromkeys(names) if n not in known]
+    return {name: i for i, name in enumerate(order)}
+
+
 class Ledger:
     def __init__(self, sectors: Dict[str, SectorLedger]):
         self.sectors = sectors
-        self.transactions: List[Transaction] = []
+        self.sector_ids = _layout(sectors, SECTORS)
+        self.account_ids = _layout((a for s in sectors.values() for a in s.accounts), ACCOUNTS)
+        self.n_accounts = len(self.account_ids)
+        self.state = np.zeros(len(self.sector_ids) * self.n_accounts)
+        # 2-D view of the same buffer: grid[sector_id, account_id].
+        self.grid = self.state.reshape(len(self.sector_ids), self.n_accounts)
+        self._idx: Dict[Tuple[str, str], int] = {}
+        # Per-slot CATEGORY_CODE (-1 for unused slots) and +1/-1 weights of assets/liabilities.
+        self._cat_codes = np.full(self.state.size, -1, dtype=np.int8)
+        self._nfa_sign = np.zeros_like(self.grid)
+        for sector_name, sector in sectors.items():
+            base = self.sector_ids[sector_name] * self.n_accounts
+            slots: Dict[str, int] = {}
+            for account in sector.accounts.values():
+                slot = base + self.account_ids[account.name]
+                slots[account.name] = slot
+                self._idx[(sector_name, account.name)] = slot
+                self._cat_codes[slot] = account.cat_code
+                if account.category != "equity":
+                    self._nfa_sign.flat[slot] = CATEGORY_SIGN[account.category]
+                account.bind(self.state, slot)
+            sector.bind(self.state, slots)
+        # Per-slot category sign, 0 for unused slots, as a list so Transaction.total reads plain floats.
+        self._slot_sign: List[float] = np.where(self._cat_codes >= 0, _SIGN_ARR[self._cat_codes], 0.0).tolist()
+        # "Sector:Account" keys and their slots, in chart order, for snapshots.
+        self._snapshot_keys = [f"{sector}:{account}" for sector, account in self._idx]
+        self._snapshot_slots = np.fromiter(self._idx.values(), dtype=np.intp, count=len(self._idx))
+        # Template postings are logged as rows of TX_LOG_DTYPE, stamped with current_step;
+        # ad-hoc Transaction objects passed to apply() are kept as they are.
+        self.current_step = 0
+        self._tx_log = np.empty(64, dtype=TX_LOG_DTYPE)
+        self._tx_count = 0
+        self.custom_transactions: List[Transaction] = []
 
     def apply(self, tx: Transaction, tol: float = 1e-6) -> None:
         imbalance = tx.total(self)
@@ -95,25 +281,109 @@ class Ledger:
             raise ValueError(f"Transaction '{tx.name}' unbalanced by {imbalance:.6f}")
         for p in tx.postings:
             self.sectors[p.sector].apply(p.account, p.amount)
-        self.transactions.append(tx)
+        self.custom_transactions.append(tx)
+
+    def slot(self, sector: str, account: str) -> int:
+        return self._idx[(sector, account)]
+
+    def get_balance(self, sector: str, account: str) -> float:
+        return float(self.state[self._idx[(sector, account)]])
+
+    def net_positions(self) -> np.ndarray:
+        """Assets minus liabilities of every sector, indexed by sector id."""
+        return np.einsum("ij,ij->i", self.grid, self._nfa_sign)
+
+    def post(self, kind: int, postings: Tuple[Tuple[int, int, int], ...], amount: float) -> None:
+        """Apply the posting template of ``kind`` (see ``flows.TX_TABLE``) scaled by ``amount``.
+
+        Templates are checked for balance once at import time, so no per-call check is needed.
+        """
+        grid = self.grid
+        for sector_id, account_id, sign in postings:
+            grid[sector_id, account_id] += sign * amount
+        n = self._tx_count
+        if n == len(self._tx_log):
+            self._reserve_tx_log(1)
+        self._tx_log[n] = (kind, amount, self.current_step)
+        self._tx_count = n + 1
+
+    def _reserve_tx_log(self, n: int) -> np.ndarray:
+        """Grow the log to fit ``n`` more rows and return its unused tail for bulk writers."""
+        count = self._tx_count
+        if count + n > len(self._tx_log):
+            grown = np.empty(max(2 * len(self._tx_log), count + n), dtype=TX_LOG_DTYPE)
+            grown[:count] = self._tx_log[:count]
+            self._tx_log = grown
+        return self._tx_log[count:]
 
-    def recompute_equity(self) -> Dict[str, float]:
+    @property
+    def transactions(self) -> np.recarray:
+        """Read-only view of the posted templates with ``kind``, ``amount`` and ``step`` fields."""
+        view = self._tx_log[: self._tx_count].view(np.recarray)
+        view.flags.writeable = False
+        return view
+
+    def copy(self) -> "Ledger":
+        """An independent ledger with the same chart and balances and an empty transaction log.
+
+        The index layout is immutable and shared; only the state and the account objects are new.
+        """
+        new = object.__new__(Ledger)
+        new.__dict__.update(self.__dict__)
+        new.state = self.state.copy()
+        new.grid = new.state.reshape(self.grid.shape)
+        new.sectors = {}
+        for sector_name, sector in self.sectors.items():
+            accounts: Dict[str, Account] = {}
+            for account in sector.accounts.values():
+                clone = Account(account.name, account.category)
+                clone._store = new.state
+                clone._slot = self._idx[(sector_name, account.name)]
+                accounts[account.name] = clone
+            clone_sector = SectorLedger(name=sector_name, accounts=accounts)
+            clone_sector._asset_slots = sector._asset_slots
+            clone_sector._liab_slots = sector._liab_slots
+            clone_sector._equity_slots = sector._equity_slots
+            clone_sector._store = new.state
+            new.sectors[sector_name] = clone_sector
+        new.current_step = 0
+        new._tx_log = np.empty(64, dtype=TX_LOG_DTYPE)
+        new._tx_count = 0
+        new.custom_transactions = []
+        return new
+
+    def recompute_equity(self, tol: float = 1e-6) -> Dict[str, float]:
+        """Reset every sector's equity to assets minus liabilities; returns the change per sector."""
+        # One tolist() of the state, then scalar sums over each sector's slot lists.
+        state = self.state
+        values = state.tolist()
         adjustments: Dict[str, float] = {}
-        for sector in self.sectors.values():
-            before = sector.equity_total()
-            sector.recompute_equity()
-            sector.assert_balanced()
-            after = sector.equity_total()
-            adjustments[sector.name] = after - before
+        for name, sector in self.sectors.items():
+            nfa = 0.0
+            for slot in sector._asset_slots:
+                nfa += values[slot]
+            for slot in sector._liab_slots:
+                nfa -= values[slot]
+            equity_slots = sector._equity_slots
+            before = 0.0
+            after = 0.0
+            if equity_slots:
+                split = nfa / len(equity_slots)
+                for slot in equity_slots:
+                    before += values[slot]
+                    state[slot] = split
+                after = split * len(equity_slots)
+            if abs(nfa - after) > tol:
+                sector.assert_balanced(tol)
+            adjustments[name] = after - before
         return adjustments
 
     def snapshot(self) -> Dict[str, float]:
-        data: Dict[str, float] = {}
-        for sector_name, sector in self.sectors.items():
-            for account in sector.accounts.values():
-                key = f"{sector_name}:{account.name}"
-                data[key] = account.balance
-        return data
+        return dict(zip(self._snapshot_keys, self.snapshot_array().tolist()))
+
+    def snapshot_array(self) -> np.ndarray:
+        """Balances in ``snapshot()`` key order as one array, without building the dict."""
+        return self.state[self._snapshot_slots]
 
 
 def default_chart(initial: Dict[str, Dict[str, float]]) -> Dict[str, SectorLedger]:
@@ -124,52 +394,22 @@ def default_chart(initial: Dict[str, Dict[str, float]]) -> Dict[str, SectorLedge
         }
         return SectorLedger(name=name, accounts=accounts)
 
-    return {
-        "Private": make_sector(
-            "Private",
-            {
-                "Deposits": "asset",
-                "Loans": "liability",
-                "PrivateLoansAsset": "asset",
-                "PrivateLoansLiability": "liability",
-                "GovBonds": "asset",
-                "BankDebt": "asset",
-                "Currency": "asset",
-                "NetWorth": "equity",
-            },
-        ),
-        "Banks": make_sector(
-            "Banks",
-            {
-                "Loans": "asset",
-                "Reserves": "asset",
-                "Deposits": "liability",
-                "BankDebt": "liability",
-                "BankEquity": "equity",
-            },
-        ),
-        "Government": make_sector(
-            "Government",
-            {
-                "TGA": "asset",
-                "GovBonds": "liability",
-                "GovEquity": "equity",
-            },
-        ),
-        "CentralBank": make_sector(
-            "CentralBank",
-            {
-                "Reserves": "liability",
-                "Currency": "liability",
-                "TGA": "liability",
-                "GovBonds": "asset",
-                "CBEq": "equity",
-            },
-        ),
-    }
+    return {name: make_sector(name, account_defs) for name, account_defs in CHART.items()}
 
 
-def build_default_ledger(initial: Dict[str, Dict[str, float]]) -> Ledger:
-    ledger = Ledger(default_chart(initial))
+@lru_cache(maxsize=16)
+def _default_ledger_template(frozen_initial: FrozenSet[Tuple[str, FrozenSet[Tuple[str, float]]]]) -> Ledger:
+    # Never handed out directly: build_default_ledger returns copies.
+    ledger = Ledger(default_chart({sector: dict(accounts) for sector, accounts in frozen_initial}))
     ledger.recompute_equity()
     return ledger
+
+
+def build_default_ledger(initial: Dict[str, Dict[str, float]]) -> Ledger:
+    """Default-chart ledger with ``initial`` balances and equity recomputed.
+
+    Ledgers for an initial balance sheet seen before are copied from a cached template,
+    so sweeps over many configs with the same initial state skip rebuilding the layout.
+    """
+    frozen = frozenset((sector, frozenset(accounts.items())) for sector, accounts in initial.items())
+    return _default_ledger_template(frozen).copy()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import ModelConfig
+from .flows import TX_TEMPLATES, TxKind
+from .ledger import ACCOUNTS, CHART, N_ACCT, SECTORS, build_default_ledger
+from .model import STOCK_COLS
+
+# Position of every ledger slot in the stock vector (STOCK_COLS order).
+_POS = {
+    SECTORS.index(sector) * N_ACCT + ACCOUNTS.index(account): i
+    for i, (sector, account) in enumerate(col.split(":", 1) for col in STOCK_COLS)
+}
+
+
+def _pos(sector: str, account: str) -> int:
+    return _POS[SECTORS.index(sector) * N_ACCT + ACCOUNTS.index(account)]
+
+
+def _template_vector(kind: TxKind) -> np.ndarray:
+    vec = np.zeros(len(STOCK_COLS))
+    for sector_id, account_id, sign in TX_TEMPLATES[kind]:
+        vec[_POS[sector_id * N_ACCT + account_id]] += sign
+    return vec
+
+
+def _equity_operator() -> np.ndarray:
+    # Identity on assets/liabilities; equity rows become (assets - liabilities) / n_equity per sector.
+    n = len(STOCK_COLS)
+    op = np.eye(n)
+    for sector, accounts in CHART.items():
+        equity = [_pos(sector, a) for a, cat in accounts.items() if cat == "equity"]
+        if not equity:
+            continue
+        row = np.zeros(n)
+        for account, category in accounts.items():
+            if category == "asset":
+                row[_pos(sector, account)] = 1.0
+            elif category == "liability":
+                row[_pos(sector, account)] = -1.0
+        for i in equity:
+            op[i] = row / len(equity)
+    return op
+
+
+def build_transition_matrix(config: ModelConfig) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(A, b)`` such that one model step maps stocks ``x`` to ``A @ x + b``.
+
+    The default behavior rules are affine in the stocks as long as loan growth stays
+    non-negative, the tax base stays non-negative and the TGA gap is always closed.
+    Callbacks and the repayment/threshold branches of ``MoneySystemModel.step`` are not
+    representable and raise ``ValueError``.
+    """
+    callbacks = (
+        config.gov_spending_fn,
+        config.tax_fn,
+        config.loan_growth_fn,
+        config.private_loan_growth_fn,
+        config.cb_bond_purchase_fn,
+    )
+    if any(fn is not None for fn in callbacks):
+        raise ValueError("Behavior callbacks cannot be expressed as a linear transition")
+    if config.loan_growth < 0 or config.private_loan_growth < 0:
+        raise ValueError("Loan repayment is not linear; loan growth rates must be non-negative")
+
+    n = len(STOCK_COLS)
+    loans = _pos("Private", "Loans")
+    deposits = _pos("Private", "Deposits")
+    private_loans = _pos("Private", "PrivateLoansAsset")
+    bonds = _pos("Private", "GovBonds")
+    reserves = _pos("Banks", "Reserves")
+
+    # Transaction amounts as rows of C (state dependent) plus constants c.
+    amounts = {
+        TxKind.LOAN_CREATION: ({loans: config.loan_growth}, 0.0),
+        TxKind.PRIVATE_LOAN_CREATION: ({private_loans: config.private_loan_growth}, 0.0),
+        TxKind.INTEREST_ON_LOANS: ({loans: config.loan_rate}, 0.0),
+        TxKind.INTEREST_ON_DEPOSITS: ({deposits: config.deposit_rate}, 0.0),
+        TxKind.INTEREST_ON_RESERVES: ({reserves: config.reserve_rate}, 0.0),
+        TxKind.INTEREST_ON_BONDS: ({bonds: config.bond_rate}, 0.0),
+        TxKind.GOVERNMENT_SPENDING: ({}, config.gov_spending),
+        TxKind.TAXES: (
+            {
+                deposits: config.tax_rate * config.deposit_rate,
+                bonds: config.tax_rate * config.bond_rate,
+                loans: -config.tax_rate * config.loan_rate,
+            },
+            config.tax_rate * config.gov_spending,
+        ),
+        TxKind.BOND_SALE_TO_CB: ({}, config.cb_bond_purchase),
+    }
+    flows_a = np.eye(n)
+    flows_b = np.zeros(n)
+    for kind, (coeffs, const) in amounts.items():
+        template = _template_vector(kind)
+        for col, coeff in coeffs.items():
+            flows_a[:, col] += template * coeff
+        flows_b += template * const
+
+    # Bond issuance closes the TGA gap left after all other flows.
+    bond_issue = _template_vector(TxKind.BOND_ISSUE)
+    tga = np.zeros(n)
+    tga[_pos("Government", "TGA")] = 1.0
+    issue = np.eye(n) - np.outer(bond_issue, tga)
+
+    equity = _equity_operator()
+    a = equity @ issue @ flows_a
+    b = equity @ (issue @ flows_b + bond_issue * config.tga_target)
+    return a, b
+
+
+def initial_stocks(config: ModelConfig) -> np.ndarray:
+    ledger = build_default_ledger(config.resolve_initial())
+    return np.array([ledger.snapshot()[col] for col in STOCK_COLS])
+
+
+def simulate_linear(config: ModelConfig) -> pd.DataFrame:
+    """Iterate ``x_{t+1} = A x_t + b`` for ``config.steps`` steps; rows match ``run().stocks``.
+
+    Raises ``ValueError`` at the first step whose taxes would be clipped at zero by the model,
+    where the affine map no longer applies.
+    """
+    a, b = build_transition_matrix(config)
+    # Taxes are tax_rate * (tax_weights @ x + gov_spending) while that stays non-negative.
+    tax_weights = np.zeros(len(STOCK_COLS))
+    tax_weights[_pos("Private", "Deposits")] = config.deposit_rate
+    tax_weights[_pos("Private", "GovBonds")] = config.bond_rate
+    tax_weights[_pos("Private", "Loans")] = -config.loan_rate
+    states = np.empty((config.steps + 1, len(STOCK_COLS)))
+    states[0] = initial_stocks(config)
+    for t in range(config.steps):
+        taxes = config.tax_rate * (tax_weights @ states[t] + config.gov_spending)
+        if taxes < 0:
+            raise ValueError(f"Tax base turns negative at step {t}; clipped taxes are not linear")
+        states[t + 1] = a @ states[t] + b
+    return pd.DataFrame(states[1:], columns=STOCK_COLS)
+
+
+def final_stocks(config: ModelConfig) -> np.ndarray:
+    """Closed-form stocks after ``config.steps`` steps via a power of the augmented matrix.
+
+    Unlike ``simulate_linear`` this cannot check the tax base along the way.
+    """
+    a, b = build_transition_matrix(config)
+    n = len(STOCK_COLS)
+    augmented = np.eye(n + 1)
+    augmented[:n, :n] = a
+    augmented[:n, n] = b
+    x0 = np.append(initial_stocks(config), 1.0)
+    return (np.linalg.matrix_power(augmented, config.steps) @ x0)[:n]
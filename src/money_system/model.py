@@ -1,27 +1,69 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
-from .config import ModelConfig
-from .flows import (
-    select_transactions,
-    tx_bond_issue,
-    tx_bond_sale_to_cb,
-    tx_government_spending,
-    tx_interest_on_bonds,
-    tx_interest_on_deposits,
-    tx_interest_on_loans,
-    tx_interest_on_reserves,
-    tx_loan_creation,
-    tx_loan_repayment,
-    tx_private_loan_creation,
-    tx_private_loan_repayment,
-    tx_taxes,
+from ._kernels import (
+    MAX_TX_PER_STEP,
+    aot_run_steps,
+    pack_categories,
+    pack_params,
+    pack_slots,
+    pack_templates,
+    run_steps,
 )
-from .ledger import Ledger, build_default_ledger
+from ._njit import HAVE_NUMBA
+from .config import ModelConfig
+from .flows import TX_TABLE, TxKind, tx_bond_issue, tx_bond_sale_to_cb
+from .io import read_results, write_results
+from .ledger import CHART, SECTORS, Ledger, Sector, build_default_ledger
+
+
+STOCK_COLS = [f"{sector}:{account}" for sector, accounts in CHART.items() for account in accounts]
+BASE_FLOW_COLS = [
+    "gov_spending",
+    "loan_change",
+    "interest_on_loans",
+    "interest_on_deposits",
+    "interest_on_reserves",
+    "interest_on_bonds",
+    "private_loan_change",
+    "cb_bond_purchase",
+    "taxes",
+    "bond_issuance",
+]
+FLOW_COLS = BASE_FLOW_COLS + [f"equity_adjustment_{sector}" for sector in SECTORS]
+METRIC_COLS = [
+    "Money_M1",
+    "Private_Debt",
+    "Private_Bonds",
+    "Bank_Reserves",
+    "Private_NFA",
+    "Banks_NFA",
+    "NonGov_NFA",
+    "Public_NFP",
+    "Sector_Balance_Check",
+]
+
+# Transaction kinds posted by step() in order, keyed by (loan_change >= 0, private_loan_change >= 0).
+_STEP_PLANS: Dict[Tuple[bool, bool], Tuple[TxKind, ...]] = {
+    (loans_up, private_loans_up): (
+        TxKind.LOAN_CREATION if loans_up else TxKind.LOAN_REPAYMENT,
+        TxKind.PRIVATE_LOAN_CREATION if private_loans_up else TxKind.PRIVATE_LOAN_REPAYMENT,
+        TxKind.INTEREST_ON_LOANS,
+        TxKind.INTEREST_ON_DEPOSITS,
+        TxKind.INTEREST_ON_RESERVES,
+        TxKind.INTEREST_ON_BONDS,
+        TxKind.GOVERNMENT_SPENDING,
+        TxKind.TAXES,
+    )
+    for loans_up in (True, False)
+    for private_loans_up in (True, False)
+}
 
 
 @dataclass
@@ -30,32 +72,33 @@ class SimulationResults:
     flows: pd.DataFrame
     metrics: pd.DataFrame
 
+    def to_parquet(self, path: Path) -> None:
+        """Write the frames to ``path/{stocks,flows,metrics}.parquet`` (zstd, requires pyarrow)."""
+        write_results(self, Path(path), "parquet")
+
+    @classmethod
+    def from_parquet(cls, path: Path) -> SimulationResults:
+        return cls(**read_results(Path(path), "parquet"))
+
+
+def _row_major_frame(rows: np.ndarray, columns: List[str]) -> pd.DataFrame:
+    # pandas copies a 2-D array into column-major storage by default; hand it an owned
+    # C-contiguous copy instead so .to_numpy() rows stay contiguous.
+    return pd.DataFrame(np.array(rows, order="C"), columns=columns, copy=False)
+
 
-def _get_balance(snapshot: Dict[str, float], sector: str, account: str) -> float:
-    return snapshot.get(f"{sector}:{account}", 0.0)
-
-
-def _compute_metrics(snapshot: Dict[str, float], ledger: Ledger) -> Dict[str, float]:
-    deposits = _get_balance(snapshot, "Private", "Deposits")
-    currency = _get_balance(snapshot, "Private", "Currency")
-    loans = _get_balance(snapshot, "Private", "Loans")
-    bonds = _get_balance(snapshot, "Private", "GovBonds")
-    reserves = _get_balance(snapshot, "Banks", "Reserves")
-    private_nfa = ledger.sectors["Private"].net_position()
-    banks_nfa = ledger.sectors["Banks"].net_position()
-    public_nfp = ledger.sectors["Government"].net_position() + ledger.sectors["CentralBank"].net_position()
-    non_gov_nfa = private_nfa + banks_nfa
-    return {
-        "Money_M1": deposits + currency,
-        "Private_Debt": loans,
-        "Private_Bonds": bonds,
-        "Bank_Reserves": reserves,
-        "Private_NFA": private_nfa,
-        "Banks_NFA": banks_nfa,
-        "NonGov_NFA": non_gov_nfa,
-        "Public_NFP": public_nfp,
-        "Sector_Balance_Check": non_gov_nfa + public_nfp,
-    }
+# Behavior-rule hooks a subclass may override; all but gov spending receive the balances dict.
+_RULE_HOOKS = (
+    "_resolve_gov_spending",
+    "_resolve_tax",
+    "_resolve_loan_change",
+    "_resolve_private_loan_change",
+    "_resolve_cb_bond_purchase",
+)
+
+
+def _float_rule(fn: Callable[..., float]) -> Callable[..., float]:
+    return lambda *args: float(fn(*args))
 
 
 class MoneySystemModel:
@@ -63,118 +106,255 @@ class MoneySystemModel:
         self.config = config
         initial = config.resolve_initial()
         self.ledger: Ledger = build_default_ledger(initial)
-        self._stock_history: List[Dict[str, float]] = []
-        self._flow_history: List[Dict[str, float]] = []
-        self._metric_history: List[Dict[str, float]] = []
+        self._stock_slots = np.array([self.ledger.slot(*col.split(":", 1)) for col in STOCK_COLS], dtype=np.int64)
+        # History rows are written in place; buffers grow if stepping past config.steps.
+        self._stock_hist = np.empty((config.steps, len(STOCK_COLS)))
+        self._flow_hist = np.empty((config.steps, len(FLOW_COLS)))
+        self._metric_hist = np.empty((config.steps, len(METRIC_COLS)))
+        self._n_recorded = 0
+        idx = self.ledger._idx
+        self._i_deposits = idx[("Private", "Deposits")]
+        self._i_currency = idx[("Private", "Currency")]
+        self._i_loans = idx[("Private", "Loans")]
+        self._i_private_loans = idx[("Private", "PrivateLoansAsset")]
+        self._i_bonds = idx[("Private", "GovBonds")]
+        self._i_reserves = idx[("Banks", "Reserves")]
+        # Behavior rules are fixed for a run, so bind each once: a config callback is called
+        # directly unless a subclass overrides the _resolve_* hook, which then always wins.
+        overridden = {name for name in _RULE_HOOKS if self._overrides(name)}
+        self._gov_spending_rule = self._resolve_gov_spending
+        if config.gov_spending_fn is not None and "_resolve_gov_spending" not in overridden:
+            self._gov_spending_rule = _float_rule(config.gov_spending_fn)
+        self._loan_change_rule = self._resolve_loan_change
+        if config.loan_growth_fn is not None and "_resolve_loan_change" not in overridden:
+            self._loan_change_rule = _float_rule(config.loan_growth_fn)
+        self._private_loan_change_rule = self._resolve_private_loan_change
+        if config.private_loan_growth_fn is not None and "_resolve_private_loan_change" not in overridden:
+            self._private_loan_change_rule = _float_rule(config.private_loan_growth_fn)
+        self._cb_bond_purchase_rule = self._resolve_cb_bond_purchase
+        if config.cb_bond_purchase_fn is not None and "_resolve_cb_bond_purchase" not in overridden:
+            self._cb_bond_purchase_rule = _float_rule(config.cb_bond_purchase_fn)
+        self._tax_rule = self._resolve_tax
+        if config.tax_fn is not None and "_resolve_tax" not in overridden:
+            tax_fn = config.tax_fn
+            self._tax_rule = lambda step, balances, flows: float(tax_fn(step, balances))
+        # The dict snapshot is only built when a callback or an overridden hook receives balances.
+        self._needs_balances = bool(overridden - {"_resolve_gov_spending"}) or any(
+            fn is not None
+            for fn in (
+                config.tax_fn,
+                config.loan_growth_fn,
+                config.private_loan_growth_fn,
+                config.cb_bond_purchase_fn,
+            )
+        )
+        # Interest flows as one vector product: rates * [loans, deposits, reserves, bonds].
+        self._rates = np.array([config.loan_rate, config.deposit_rate, config.reserve_rate, config.bond_rate])
+        self._interest_slots = np.array(
+            [
+                self.ledger.slot("Private", "Loans"),
+                self.ledger.slot("Private", "Deposits"),
+                self.ledger.slot("Banks", "Reserves"),
+                self.ledger.slot("Private", "GovBonds"),
+            ]
+        )
 
     def snapshot(self) -> Dict[str, float]:
         return self.ledger.snapshot()
 
+    def _compute_metrics(self, out: np.ndarray) -> None:
+        """Write the METRIC_COLS row for the current state into ``out``."""
+        state = self.ledger.state
+        nfa = self.ledger.net_positions()
+        private_nfa = nfa[Sector.PRIVATE]
+        banks_nfa = nfa[Sector.BANKS]
+        public_nfp = nfa[Sector.GOVERNMENT] + nfa[Sector.CENTRAL_BANK]
+        non_gov_nfa = private_nfa + banks_nfa
+        out[:] = (
+            state[self._i_deposits] + state[self._i_currency],
+            state[self._i_loans],
+            state[self._i_bonds],
+            state[self._i_reserves],
+            private_nfa,
+            banks_nfa,
+            non_gov_nfa,
+            public_nfp,
+            non_gov_nfa + public_nfp,
+        )
+
+    @classmethod
+    def _overrides(cls, name: str) -> bool:
+        return getattr(cls, name) is not getattr(MoneySystemModel, name)
+
     def _resolve_gov_spending(self, step: int) -> float:
         if self.config.gov_spending_fn is not None:
             return float(self.config.gov_spending_fn(step))
         return float(self.config.gov_spending)
 
-    def _resolve_tax(self, step: int, balances: Dict[str, float], flows: Dict[str, float]) -> float:
+    def _resolve_tax(self, step: int, balances: Dict[str, float] | None, flows: Dict[str, float]) -> float:
         if self.config.tax_fn is not None:
             return float(self.config.tax_fn(step, balances))
         tax_base = flows["gov_spending"] + flows["interest_on_deposits"] + flows["interest_on_bonds"]
         tax_base -= flows["interest_on_loans"]
         return max(0.0, self.config.tax_rate * tax_base)
 
-    def _resolve_loan_change(self, step: int, balances: Dict[str, float]) -> float:
+    def _resolve_loan_change(self, step: int, balances: Dict[str, float] | None) -> float:
         if self.config.loan_growth_fn is not None:
             return float(self.config.loan_growth_fn(step, balances))
-        loans = _get_balance(balances, "Private", "Loans")
-        return self.config.loan_growth * loans
+        return self.config.loan_growth * float(self.ledger.state[self._i_loans])
 
-    def _resolve_private_loan_change(self, step: int, balances: Dict[str, float]) -> float:
+    def _resolve_private_loan_change(self, step: int, balances: Dict[str, float] | None) -> float:
         if self.config.private_loan_growth_fn is not None:
             return float(self.config.private_loan_growth_fn(step, balances))
-        loans = _get_balance(balances, "Private", "PrivateLoansAsset")
-        return self.config.private_loan_growth * loans
+        return self.config.private_loan_growth * float(self.ledger.state[self._i_private_loans])
 
-    def _resolve_cb_bond_purchase(self, step: int, balances: Dict[str, float]) -> float:
+    def _resolve_cb_bond_purchase(self, step: int, balances: Dict[str, float] | None) -> float:
         if self.config.cb_bond_purchase_fn is not None:
             return float(self.config.cb_bond_purchase_fn(step, balances))
         return float(self.config.cb_bond_purchase)
 
     def step(self, step: int) -> Tuple[Dict[str, float], Dict[str, float], Dict[str, float]]:
-        balances = self.snapshot()
+        self.ledger.current_step = step
+        balances = self.snapshot() if self._needs_balances else None
 
-        loans = _get_balance(balances, "Private", "Loans")
-        deposits = _get_balance(balances, "Private", "Deposits")
-        private_loans = _get_balance(balances, "Private", "PrivateLoansAsset")
-        bonds = _get_balance(balances, "Private", "GovBonds")
-        reserves = _get_balance(balances, "Banks", "Reserves")
+        deposits = float(self.ledger.state[self._i_deposits])
+        private_loans = float(self.ledger.state[self._i_private_loans])
+        interest_loans, interest_deposits, interest_reserves, interest_bonds = (
+            self._rates * self.ledger.state[self._interest_slots]
+        ).tolist()
 
         flows = {
-            "gov_spending": self._resolve_gov_spending(step),
-            "loan_change": self._resolve_loan_change(step, balances),
-            "interest_on_loans": self.config.loan_rate * loans,
-            "interest_on_deposits": self.config.deposit_rate * deposits,
-            "interest_on_reserves": self.config.reserve_rate * reserves,
-            "interest_on_bonds": self.config.bond_rate * bonds,
+            "gov_spending": self._gov_spending_rule(step),
+            "loan_change": self._loan_change_rule(step, balances),
+            "interest_on_loans": interest_loans,
+            "interest_on_deposits": interest_deposits,
+            "interest_on_reserves": interest_reserves,
+            "interest_on_bonds": interest_bonds,
         }
-        flows["private_loan_change"] = self._resolve_private_loan_change(step, balances)
-        flows["cb_bond_purchase"] = self._resolve_cb_bond_purchase(step, balances)
-        flows["taxes"] = self._resolve_tax(step, balances, flows)
-
-        txs = []
-        if flows["loan_change"] >= 0:
-            txs.append(tx_loan_creation(flows["loan_change"]))
-        else:
-            repayment = min(-flows["loan_change"], deposits)
-            txs.append(tx_loan_repayment(repayment))
-
-        if flows["private_loan_change"] >= 0:
-            txs.append(tx_private_loan_creation(flows["private_loan_change"]))
-        else:
-            repayment = min(-flows["private_loan_change"], private_loans)
-            txs.append(tx_private_loan_repayment(repayment))
+        flows["private_loan_change"] = self._private_loan_change_rule(step, balances)
+        flows["cb_bond_purchase"] = self._cb_bond_purchase_rule(step, balances)
+        flows["taxes"] = self._tax_rule(step, balances, flows)
 
-        txs.extend(
-            [
-                tx_interest_on_loans(flows["interest_on_loans"]),
-                tx_interest_on_deposits(flows["interest_on_deposits"]),
-                tx_interest_on_reserves(flows["interest_on_reserves"]),
-                tx_interest_on_bonds(flows["interest_on_bonds"]),
-                tx_government_spending(flows["gov_spending"]),
-                tx_taxes(flows["taxes"]),
-            ]
+        loan_change = flows["loan_change"]
+        private_loan_change = flows["private_loan_change"]
+        amounts = (
+            loan_change if loan_change >= 0 else min(-loan_change, deposits),
+            private_loan_change if private_loan_change >= 0 else min(-private_loan_change, private_loans),
+            flows["interest_on_loans"],
+            flows["interest_on_deposits"],
+            flows["interest_on_reserves"],
+            flows["interest_on_bonds"],
+            flows["gov_spending"],
+            flows["taxes"],
         )
-
-        for tx in select_transactions(txs):
-            self.ledger.apply(tx)
+        plan = _STEP_PLANS[(loan_change >= 0, private_loan_change >= 0)]
+        for kind, amount in zip(plan, amounts):
+            if amount != 0.0:
+                self.ledger.post(kind, TX_TABLE[kind], amount)
 
         if abs(flows["cb_bond_purchase"]) > 1e-9:
-            self.ledger.apply(tx_bond_sale_to_cb(flows["cb_bond_purchase"]))
+            self.ledger.post(*tx_bond_sale_to_cb(flows["cb_bond_purchase"]))
 
-        tga_balance = _get_balance(self.snapshot(), "Government", "TGA")
+        tga_balance = self.ledger.get_balance("Government", "TGA")
         tga_gap = self.config.tga_target - tga_balance
         if abs(tga_gap) > 1e-6:
-            self.ledger.apply(tx_bond_issue(tga_gap))
+            self.ledger.post(*tx_bond_issue(tga_gap))
             flows["bond_issuance"] = tga_gap
         else:
             flows["bond_issuance"] = 0.0
 
         equity_adjustments = self.ledger.recompute_equity()
 
-        stocks = self.snapshot()
-        metrics = _compute_metrics(stocks, self.ledger)
         for sector, delta in equity_adjustments.items():
             flows[f"equity_adjustment_{sector}"] = delta
 
-        self._stock_history.append(stocks)
-        self._flow_history.append(flows)
-        self._metric_history.append(metrics)
+        row = self._next_row()
+        np.take(self.ledger.state, self._stock_slots, out=self._stock_hist[row])
+        self._flow_hist[row] = [flows[col] for col in FLOW_COLS]
+        self._compute_metrics(self._metric_hist[row])
 
+        stocks = dict(zip(STOCK_COLS, self._stock_hist[row].tolist()))
+        metrics = dict(zip(METRIC_COLS, self._metric_hist[row].tolist()))
         return stocks, flows, metrics
 
+    def _next_row(self) -> int:
+        """Claim the next history row, doubling the buffers when they are full."""
+        row = self._n_recorded
+        if row == len(self._stock_hist):
+            self._reserve(max(2 * row, 1))
+        self._n_recorded = row + 1
+        return row
+
+    def _reserve(self, rows: int) -> None:
+        for name in ("_stock_hist", "_flow_hist", "_metric_hist"):
+            old = getattr(self, name)
+            if len(old) < rows:
+                new = np.empty((rows, old.shape[1]))
+                new[: len(old)] = old
+                setattr(self, name, new)
+
+    def snapshot_frames(self) -> SimulationResults:
+        """Results for the steps recorded so far, built from the history buffers without re-simulating."""
+        n = self._n_recorded
+        return SimulationResults(
+            stocks=_row_major_frame(self._stock_hist[:n], STOCK_COLS),
+            flows=_row_major_frame(self._flow_hist[:n], FLOW_COLS),
+            metrics=_row_major_frame(self._metric_hist[:n], METRIC_COLS),
+        )
+
+    def _uses_default_rules(self) -> bool:
+        # gov_spending_fn only depends on the step, so the kernel takes it as a precomputed path.
+        # The kernel replicates step() and the base behavior rules, so any subclass override
+        # of those needs the Python loop.
+        config = self.config
+        callbacks = (
+            config.tax_fn,
+            config.loan_growth_fn,
+            config.private_loan_growth_fn,
+            config.cb_bond_purchase_fn,
+        )
+        if any(self._overrides(name) for name in ("step", "_compute_metrics") + _RULE_HOOKS):
+            return False
+        return all(fn is None for fn in callbacks)
+
+    def _run_compiled(self) -> None:
+        ledger = self.ledger
+        steps = self.config.steps
+        self._reserve(self._n_recorded + steps)
+        rows = slice(self._n_recorded, self._n_recorded + steps)
+        tpl_slots, tpl_signs, tpl_offsets = pack_templates(ledger.n_accounts)
+        gov_spending = np.array([self._gov_spending_rule(step) for step in range(steps)])
+        tx_log = ledger._reserve_tx_log(MAX_TX_PER_STEP * steps)
+        kernel = aot_run_steps if aot_run_steps is not None else run_steps
+        n_logged = kernel(
+            ledger.state,
+            len(SECTORS),
+            ledger.n_accounts,
+            pack_categories(ledger),
+            pack_params(self.config),
+            gov_spending,
+            pack_slots(ledger),
+            tpl_slots,
+            tpl_signs,
+            tpl_offsets,
+            self._stock_slots,
+            self._stock_hist[rows],
+            self._flow_hist[rows],
+            self._metric_hist[rows],
+            tx_log["kind"],
+            tx_log["amount"],
+            tx_log["step"],
+            steps,
+        )
+        ledger._tx_count += n_logged
+        ledger.current_step = steps - 1
+        self._n_recorded += steps
+
     def run(self) -> SimulationResults:
-        for step in range(self.config.steps):
-            self.step(step)
-        stocks = pd.DataFrame(self._stock_history)
-        flows = pd.DataFrame(self._flow_history)
-        metrics = pd.DataFrame(self._metric_history)
-        return SimulationResults(stocks=stocks, flows=flows, metrics=metrics)
+        # The compiled kernel covers the default behavior rules; callbacks and overrides need the Python step.
+        if (aot_run_steps is not None or HAVE_NUMBA) and self._uses_default_rules():
+            self._run_compiled()
+        else:
+            for step in range(self.config.steps):
+                self.step(step)
+        return self.snapshot_frames()
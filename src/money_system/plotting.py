@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 
 @dataclass
@@ -45,8 +49,10 @@ def plot_timeseries(
     cols = _select_columns(df, series)
     if ax is None:
         _, ax = plt.subplots()
-    for col in cols:
-        ax.plot(df.index, df[col], label=col)
+    x = df.index.to_numpy()
+    arr = df.to_numpy()[:, df.columns.get_indexer(cols)]
+    for k, col in enumerate(cols):
+        ax.plot(x, arr[:, k], label=col)
     if title:
         ax.set_title(title)
     if ylabel:
@@ -57,11 +63,27 @@ def plot_timeseries(
     return ax
 
 
+@lru_cache(maxsize=32)
+def _index_by_sector(columns: Tuple[str, ...]) -> Dict[str, np.ndarray]:
+    """Positions of the "Sector:Account" columns of each sector, computed once per column layout."""
+    groups: Dict[str, List[int]] = {}
+    for i, col in enumerate(columns):
+        sector, sep, _ = col.partition(":")
+        if sep:
+            groups.setdefault(sector, []).append(i)
+    out = {sector: np.array(idx) for sector, idx in groups.items()}
+    for idx in out.values():
+        idx.flags.writeable = False
+    return out
+
+
 def plot_sector_balance_sheet(stocks: pd.DataFrame, sector: str) -> plt.Figure:
-    cols = [c for c in stocks.columns if c.startswith(f"{sector}:")]
+    idx = _index_by_sector(tuple(stocks.columns)).get(sector, np.array([], dtype=int))
+    x = stocks.index.to_numpy()
+    arr = stocks.to_numpy()[:, idx]
     fig, ax = plt.subplots()
-    for col in cols:
-        ax.plot(stocks.index, stocks[col], label=col.split(":", 1)[1])
+    for k, col in enumerate(stocks.columns[idx]):
+        ax.plot(x, arr[:, k], label=col.split(":", 1)[1])
     ax.set_title(f"{sector} Balance Sheet")
     ax.set_xlabel("Step")
     ax.set_ylabel("Level")
@@ -103,32 +125,112 @@ def plot_dashboard(
 
 
 class LivePlotter:
-    def __init__(self, series: Dict[str, List[str]]):
+    """Live line plots redrawn by blitting: only the lines are repainted on each update.
+
+    Axis limits grow in jumps (x doubles, y gains headroom) so the static background,
+    which requires a full draw, is only re-rendered when the data leaves the current view.
+    With ``interactive=False`` the figure is rendered off-screen on an Agg canvas. Canvases
+    without blitting support (e.g. SVG/PDF backends) fall back to ``draw_idle``.
+    """
+
+    def __init__(
+        self,
+        series: Dict[str, List[str]],
+        columns: Dict[str, Sequence[str]],
+        interactive: bool = True,
+    ):
         self.series = series
-        self.fig, self.axes = plt.subplots(len(series), 1, figsize=(10, 4 * len(series)))
-        if isinstance(self.axes, plt.Axes):
-            self.axes = [self.axes]
+        # Column positions of each plotted series within its panel's history array.
+        self._col_idx = {panel: [list(columns[panel]).index(c) for c in cols] for panel, cols in series.items()}
+        self._x = np.arange(0)
+        figsize = (10, 4 * len(series))
+        if interactive:
+            # pyplot is only used to get a window from the configured GUI backend.
+            self.fig = plt.figure(figsize=figsize, layout="constrained")
         else:
-            self.axes = list(self.axes)
+            self.fig = Figure(figsize=figsize, layout="constrained")
+            FigureCanvasAgg(self.fig)
+        self.axes = list(np.atleast_1d(self.fig.subplots(len(series), 1)))
         self.lines: Dict[str, Dict[str, plt.Line2D]] = {}
-        plt.ion()
-        self.fig.show()
-
-    def update(self, data: Dict[str, pd.DataFrame]) -> None:
+        # Rows of each panel already checked against the axis limits, and their data range.
+        self._seen: Dict[str, int] = {}
+        self._extent: Dict[str, Tuple[float, float]] = {}
+        self._backgrounds: List = []
+        self._blit = self.fig.canvas.supports_blit
+        # Any full draw (ours or a window resize) refreshes the blit backgrounds.
+        self.fig.canvas.mpl_connect("draw_event", self._capture_backgrounds)
+        if interactive:
+            self.fig.show()
+
+    def _capture_backgrounds(self, event=None) -> None:
+        canvas = self.fig.canvas
+        # savefig to a vector format draws on a temporary non-blitting canvas.
+        if self._blit and canvas.supports_blit:
+            self._backgrounds = [canvas.copy_from_bbox(ax.bbox) for ax in self.axes]
+
+    def _fit_limits(self, ax: plt.Axes, panel: str, step: int, new_rows: np.ndarray) -> bool:
+        """Widen the limits of ``ax`` to cover ``step`` and ``new_rows``; returns whether they changed."""
+        changed = False
+        if step >= ax.get_xlim()[1] or panel not in self._seen:
+            ax.set_xlim(0, max(2 * step, 10))
+            changed = True
+        # inf and NaN cannot be axis limits; rows without any finite value leave the y range alone.
+        finite = new_rows[np.isfinite(new_rows)]
+        if finite.size:
+            lo = float(finite.min())
+            hi = float(finite.max())
+            if panel in self._extent:
+                lo = min(lo, self._extent[panel][0])
+                hi = max(hi, self._extent[panel][1])
+            self._extent[panel] = (lo, hi)
+            y0, y1 = ax.get_ylim()
+            if changed or lo < y0 or hi > y1:
+                pad = 0.1 * (hi - lo) or max(0.1 * abs(hi), 1.0)
+                ax.set_ylim(lo - pad, hi + pad)
+                changed = True
+        return changed
+
+    def update(self, data: Dict[str, np.ndarray], step: int) -> None:
+        """Redraw from history arrays (rows = steps); only rows ``0..step`` are plotted, as views."""
+        if len(self._x) <= step:
+            self._x = np.arange(2 * (step + 1))
+        x = self._x[: step + 1]
+        redraw = False
         for ax, (panel, cols) in zip(self.axes, self.series.items()):
-            df = data[panel]
-            if panel not in self.lines:
+            idx = self._col_idx[panel]
+            arr = data[panel][: step + 1]
+            first = panel not in self.lines
+            if first:
                 self.lines[panel] = {}
-                for col in cols:
-                    (line,) = ax.plot(df.index, df[col], label=col)
+                for col, k in zip(cols, idx):
+                    (line,) = ax.plot(x, arr[:, k], label=col, animated=self._blit)
                     self.lines[panel][col] = line
                 ax.set_title(panel)
                 ax.legend(loc="best")
             else:
-                for col in cols:
-                    line = self.lines[panel][col]
-                    line.set_data(df.index, df[col])
-                ax.relim()
-                ax.autoscale_view()
-        self.fig.canvas.draw()
-        self.fig.canvas.flush_events()
+                for col, k in zip(cols, idx):
+                    self.lines[panel][col].set_data(x, arr[:, k])
+            redraw |= self._fit_limits(ax, panel, step, arr[self._seen.get(panel, 0) :, idx])
+            self._seen[panel] = step + 1
+
+        canvas = self.fig.canvas
+        if not self._blit:
+            canvas.draw_idle()
+            canvas.flush_events()
+            return
+        if redraw:
+            # The full draw skips the animated lines and its draw_event captures the backgrounds.
+            canvas.draw()
+        for ax, background, lines in zip(self.axes, self._backgrounds, self.lines.values()):
+            canvas.restore_region(background)
+            for line in lines.values():
+                ax.draw_artist(line)
+            canvas.blit(ax.bbox)
+        canvas.flush_events()
+
+    def finalize(self) -> None:
+        """Make the lines regular artists again so a final ``show``/``savefig`` draws them."""
+        for lines in self.lines.values():
+            for line in lines.values():
+                line.set_animated(False)
+        self.fig.canvas.draw_idle()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from ._kernels import (
+    N_BASE_FLOWS,
+    N_METRICS,
+    P_GOV_SPENDING,
+    pack_categories,
+    pack_params,
+    pack_slots,
+    pack_templates,
+    run_steps,
+)
+from ._njit import njit, prange
+from .config import ModelConfig
+from .ledger import SECTORS, build_default_ledger
+from .model import STOCK_COLS
+
+
+@njit(parallel=True, cache=True)
+def _sweep(
+    state0,
+    n_sectors,
+    n_accounts,
+    cats,
+    params,
+    gov_spending_paths,
+    slots,
+    tpl_slots,
+    tpl_signs,
+    tpl_offsets,
+    stock_slots,
+    stock_out,
+    flow_out,
+    metric_out,
+    n_steps,
+):
+    # Sweeps keep no per-run transaction log.
+    no_log_kind = np.empty(0, dtype=np.uint8)
+    no_log_amount = np.empty(0)
+    no_log_step = np.empty(0, dtype=np.int32)
+    for i in prange(params.shape[0]):
+        run_steps(
+            state0.copy(),
+            n_sectors,
+            n_accounts,
+            cats,
+            params[i],
+            gov_spending_paths[i],
+            slots,
+            tpl_slots,
+            tpl_signs,
+            tpl_offsets,
+            stock_slots,
+            stock_out[i],
+            flow_out[i],
+            metric_out[i],
+            no_log_kind,
+            no_log_amount,
+            no_log_step,
+            n_steps,
+        )
+
+
+def sweep_params(
+    configs: Sequence[ModelConfig],
+    initial: Dict[str, Dict[str, float]] | None = None,
+) -> np.ndarray:
+    """Stack the kernel parameter vectors of ``configs`` into an ``(n_runs, n_params)`` array.
+
+    Only the numeric rates and levels are swept. Configs with behavior callbacks, or whose
+    initial balance sheet differs from the shared ``initial`` later passed to ``run_sweep``,
+    raise ``ValueError`` instead of being silently simulated with the wrong rules or state.
+    """
+    shared = build_default_ledger(initial if initial is not None else ModelConfig().resolve_initial()).state
+    for i, config in enumerate(configs):
+        callbacks = (
+            config.gov_spending_fn,
+            config.tax_fn,
+            config.loan_growth_fn,
+            config.private_loan_growth_fn,
+            config.cb_bond_purchase_fn,
+        )
+        if any(fn is not None for fn in callbacks):
+            raise ValueError(f"Config {i}: behavior callbacks cannot be swept")
+        if not np.array_equal(build_default_ledger(config.resolve_initial()).state, shared):
+            raise ValueError(f"Config {i}: initial balance sheet differs from the sweep's shared initial")
+    return np.stack([pack_params(config) for config in configs])
+
+
+def run_sweep(
+    params: np.ndarray,
+    steps: int,
+    initial: Dict[str, Dict[str, float]] | None = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Run one simulation per row of ``params`` in parallel from a shared initial balance sheet.
+
+    Only the default behavior rules are supported (no callbacks). Returns stock, flow and
+    metric arrays of shape ``(n_runs, steps, n_cols)`` in STOCK_COLS/FLOW_COLS/METRIC_COLS order.
+    """
+    ledger = build_default_ledger(initial if initial is not None else ModelConfig().resolve_initial())
+    params = np.ascontiguousarray(params, dtype=np.float64)
+    n_runs = params.shape[0]
+    gov_spending_paths = np.repeat(params[:, P_GOV_SPENDING, None], steps, axis=1)
+    stock_out = np.empty((n_runs, steps, len(STOCK_COLS)))
+    flow_out = np.empty((n_runs, steps, N_BASE_FLOWS + len(SECTORS)))
+    metric_out = np.empty((n_runs, steps, N_METRICS))
+    stock_slots = np.array([ledger.slot(*col.split(":", 1)) for col in STOCK_COLS], dtype=np.int64)
+    tpl_slots, tpl_signs, tpl_offsets = pack_templates(ledger.n_accounts)
+    _sweep(
+        ledger.state,
+        len(SECTORS),
+        ledger.n_accounts,
+        pack_categories(ledger),
+        params,
+        gov_spending_paths,
+        pack_slots(ledger),
+        tpl_slots,
+        tpl_signs,
+        tpl_offsets,
+        stock_slots,
+        stock_out,
+        flow_out,
+        metric_out,
+        steps,
+    )
+    return stock_out, flow_out, metric_out
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+import money_system.model as model
+from money_system import ModelConfig, MoneySystemModel
+from money_system.linear import simulate_linear
+
+CONFIGS = {
+    "default": {},
+    "cb_purchase": {"cb_bond_purchase": 2.0, "tax_rate": 0.3},
+    "loan_repayment": {"loan_growth": -0.01, "private_loan_growth": -0.02},
+    "gov_spending_fn": {"gov_spending_fn": lambda step: 10.0 + step % 12},
+}
+LINEAR_CONFIGS = ["default", "cb_purchase"]
+
+
+def run_python(config: ModelConfig, monkeypatch: pytest.MonkeyPatch) -> model.SimulationResults:
+    monkeypatch.setattr(model, "HAVE_NUMBA", False)
+    monkeypatch.setattr(model, "aot_run_steps", None)
+    return MoneySystemModel(config).run()
+
+
+@pytest.mark.parametrize("name", CONFIGS)
+def test_kernel_matches_python_step(name, monkeypatch):
+    if not model.HAVE_NUMBA:
+        pytest.skip("numba is not installed")
+    config = ModelConfig(steps=120, **CONFIGS[name])
+    kernel = MoneySystemModel(config)
+    compiled = kernel.run()
+    python = run_python(config, monkeypatch)
+    for field in ("stocks", "flows", "metrics"):
+        expected = getattr(python, field)
+        actual = getattr(compiled, field)
+        assert list(actual.columns) == list(expected.columns)
+        np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+    python_model = MoneySystemModel(config)
+    for step in range(config.steps):
+        python_model.step(step)
+    np.testing.assert_array_equal(kernel.ledger.transactions.kind, python_model.ledger.transactions.kind)
+    np.testing.assert_allclose(kernel.ledger.transactions.amount, python_model.ledger.transactions.amount)
+
+
+@pytest.mark.parametrize("name", LINEAR_CONFIGS)
+def test_simulate_linear_matches_run(name, monkeypatch):
+    config = ModelConfig(steps=120, **CONFIGS[name])
+    expected = run_python(config, monkeypatch).stocks
+    actual = simulate_linear(config)
+    assert list(actual.columns) == list(expected.columns)
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+def test_simulate_linear_rejects_negative_tax_base():
+    with pytest.raises(ValueError):
+        simulate_linear(ModelConfig(steps=12, tax_rate=0.9, gov_spending=0.0))
+
+
+def test_result_frames_are_row_major():
+    results = MoneySystemModel(ModelConfig(steps=24)).run()
+    for df in (results.stocks, results.flows, results.metrics):
+        assert df.to_numpy().flags.c_contiguous
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from money_system import ModelConfig, MoneySystemModel
+from money_system.interactive import InteractiveLayout, _series_traces, write_cached_dashboard_html
+
+
+def test_cached_dashboard_evicts_stale_renders(tmp_path):
+    path = tmp_path / "dash.html"
+    keep = tmp_path / "dash.notes.html"
+    keep.write_text("not a render")
+    first = MoneySystemModel(ModelConfig(steps=12)).run()
+    cached = write_cached_dashboard_html(first.stocks, first.flows, first.metrics, path)
+    assert write_cached_dashboard_html(first.stocks, first.flows, first.metrics, path) == cached
+
+    second = MoneySystemModel(ModelConfig(steps=13)).run()
+    updated = write_cached_dashboard_html(second.stocks, second.flows, second.metrics, path)
+    assert updated != cached
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([path.name, keep.name, updated.name])
+    assert path.read_bytes() == updated.read_bytes()
+
+
+def test_cached_dashboard_keys_on_index(tmp_path):
+    results = MoneySystemModel(ModelConfig(steps=12)).run()
+    path = tmp_path / "dash.html"
+    cached = write_cached_dashboard_html(results.stocks, results.flows, results.metrics, path)
+    shifted = [df.set_axis(df.index + 1) for df in (results.stocks, results.flows, results.metrics)]
+    assert write_cached_dashboard_html(*shifted, path) != cached
+
+
+@pytest.mark.parametrize("n_rows", [3, 7000, 10000])
+def test_downsampling_keeps_first_and_last_row(n_rows):
+    df = pd.DataFrame({"a": np.arange(n_rows, dtype=float)})
+    (trace,) = _series_traces(df, ["a", "missing"], max_points=5000)
+    assert len(trace.x) == min(n_rows, 5000)
+    assert trace.x[0] == 0 and trace.x[-1] == n_rows - 1
+    assert trace.y[-1] == n_rows - 1
+    assert (np.diff(trace.x) > 0).all()
+
+
+def test_layout_rejects_non_positive_max_points():
+    with pytest.raises(ValueError):
+        InteractiveLayout(max_points=0)
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import money_system.io as io
+from money_system import ModelConfig, MoneySystemModel
+from money_system.model import SimulationResults
+
+
+@pytest.fixture(scope="module")
+def results():
+    return MoneySystemModel(ModelConfig(steps=60)).run()
+
+
+def test_parquet_round_trip(results, tmp_path):
+    pytest.importorskip("pyarrow")
+    results.to_parquet(tmp_path)
+    loaded = SimulationResults.from_parquet(tmp_path)
+    for name in ("stocks", "flows", "metrics"):
+        pd.testing.assert_frame_equal(getattr(loaded, name), getattr(results, name))
+
+
+@pytest.mark.parametrize("with_pyarrow", [True, False], ids=["pyarrow", "numpy"])
+def test_csv_round_trip(results, tmp_path, monkeypatch, with_pyarrow):
+    if with_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(io, "pa", None)
+    io.write_results(results, tmp_path, "csv")
+    loaded = io.read_results(tmp_path, "csv")
+    for name in ("stocks", "flows", "metrics"):
+        expected = getattr(results, name)
+        assert (tmp_path / f"{name}.csv").read_text() == expected.to_csv(index=False)
+        np.testing.assert_array_equal(loaded[name].to_numpy(), expected.to_numpy())
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import money_system.model as model
+from money_system import ModelConfig, MoneySystemModel
+
+
+class FixedLoanChange(MoneySystemModel):
+    def _resolve_loan_change(self, step, balances):
+        return 5.0
+
+
+class BalanceLoanChange(MoneySystemModel):
+    def _resolve_loan_change(self, step, balances):
+        return 0.02 * balances["Private:Loans"]
+
+
+@pytest.fixture(params=[True, False], ids=["compiled", "python"])
+def compiled(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(model, "HAVE_NUMBA", False)
+        monkeypatch.setattr(model, "aot_run_steps", None)
+    return request.param
+
+
+def test_run_honors_overridden_rule(compiled):
+    flows = FixedLoanChange(ModelConfig(steps=12)).run().flows
+    np.testing.assert_array_equal(flows["loan_change"].to_numpy(), 5.0)
+
+
+def test_overridden_rule_receives_balances(compiled):
+    results = BalanceLoanChange(ModelConfig(steps=12)).run()
+    loans = results.stocks["Private:Loans"].to_numpy()
+    expected = 0.02 * np.concatenate([[ModelConfig().resolve_initial()["Private"]["Loans"]], loans[:-1]])
+    np.testing.assert_allclose(results.flows["loan_change"].to_numpy(), expected)
+
+
+def test_overridden_rule_takes_precedence_over_config_callback(compiled):
+    config = ModelConfig(steps=6, loan_growth_fn=lambda step, balances: 2.0)
+    flows = FixedLoanChange(config).run().flows
+    np.testing.assert_array_equal(flows["loan_change"].to_numpy(), 5.0)
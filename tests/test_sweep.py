@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from money_system import ModelConfig, MoneySystemModel
+from money_system.sweep import run_sweep, sweep_params
+
+
+def test_sweep_matches_individual_runs():
+    configs = [ModelConfig(steps=60, loan_growth=g) for g in (0.0, 0.005, 0.01)]
+    stocks, flows, metrics = run_sweep(sweep_params(configs), 60)
+    for i, config in enumerate(configs):
+        results = MoneySystemModel(config).run()
+        np.testing.assert_allclose(stocks[i], results.stocks.to_numpy(), rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(flows[i], results.flows.to_numpy(), rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(metrics[i], results.metrics.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+def test_sweep_rejects_callbacks():
+    with pytest.raises(ValueError, match="callbacks"):
+        sweep_params([ModelConfig(), ModelConfig(tax_fn=lambda step, balances, flows: 0.0)])
+
+
+def test_sweep_rejects_mismatched_initial():
+    with pytest.raises(ValueError, match="initial"):
+        sweep_params([ModelConfig(initial={"Private": {"Deposits": 1.0}})])